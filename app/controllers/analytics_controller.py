@@ -1,59 +1,242 @@
 """
 Analytics controller
+
+The dashboard reads incrementally maintained rollup tables instead of
+aggregating the raw business, order and analytics event tables. The
+record_* helpers keep the rollups current and run inside the caller's
+transaction.
 """
-from datetime import datetime, timedelta
-from typing import Dict, List
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, func
-from sqlalchemy import extract
+from sqlmodel import select, func, delete
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.models.business import Business
 from app.models.order import Order
-from app.models.analytics import AnalyticsEvent
+from app.models.analytics import (
+    AnalyticsEvent,
+    OrderHourlyRollup,
+    OrderStatusRollup,
+    CategoryRollup,
+    SearchTermDailyRollup,
+)
 
 
-async def get_business_stats(db: AsyncSession) -> Dict[str, int]:
-    """Get business statistics."""
-    total = await db.execute(select(func.count(Business.id)))
-    total_count = total.scalar() or 0
+# (category, is_active, is_verified) snapshot of a business for rollups
+BusinessRollupState = Tuple[str, bool, bool]
+
+
+def _hour_bucket(moment: datetime) -> datetime:
+    """Truncate a timestamp to the start of its hour."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+async def _increment(db: AsyncSession, model: Any, key: Dict[str, Any], **deltas: int) -> None:
+    """Atomically add deltas to a rollup row, creating it if needed."""
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(model).values(**key, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={
+            column: getattr(model, column) + stmt.excluded[column]
+            for column in deltas
+        }
+    )
+    await db.execute(stmt)
+
+
+async def record_order_created(db: AsyncSession, order: Order) -> None:
+    """Count a new order in the hourly and status rollups."""
+    await _increment(db, OrderHourlyRollup, {"bucket": _hour_bucket(order.created_at)}, count=1)
+    await _increment(db, OrderStatusRollup, {"status": order.status}, count=1)
+
+
+async def record_order_status_change(
+    db: AsyncSession,
+    old_status: str,
+    new_status: str,
+    orders: int = 1
+) -> None:
+    """Move one or more orders between status counters."""
+    if old_status == new_status:
+        return
+    await _increment(db, OrderStatusRollup, {"status": old_status}, count=-orders)
+    await _increment(db, OrderStatusRollup, {"status": new_status}, count=orders)
+
+
+async def record_business_change(
+    db: AsyncSession,
+    before: Optional[BusinessRollupState],
+    after: Optional[BusinessRollupState]
+) -> None:
+    """Update category counters for a created or modified business."""
+    if before == after:
+        return
+    for state, sign in ((before, -1), (after, 1)):
+        if state is None:
+            continue
+        category, is_active, is_verified = state
+        await _increment(
+            db,
+            CategoryRollup,
+            {"category": category},
+            total_count=sign,
+            active_count=sign if is_active else 0,
+            verified_count=sign if is_verified else 0
+        )
+
+
+def business_rollup_state(business: Business) -> BusinessRollupState:
+    """Snapshot the fields of a business that the rollups depend on."""
+    return (business.category, bool(business.is_active), bool(business.is_verified))
+
+
+async def record_search_events(db: AsyncSession, events: Iterable[Dict[str, Any]]) -> None:
+    """Count a batch of analytics events into the daily search-term rollup."""
+    counts = Counter(
+        (event["timestamp"].date(), event["search_term"])
+        for event in events
+        if event["event_type"] == "search" and event.get("search_term") is not None
+    )
+    for (day, search_term), count in counts.items():
+        await _increment(
+            db,
+            SearchTermDailyRollup,
+            {"day": day, "search_term": search_term},
+            count=count
+        )
+
+
+def _as_datetime(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(value)
+
+
+def _as_date(value: Any) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+async def rebuild_rollups(db: AsyncSession) -> None:
+    """Recompute every rollup table from the raw tables."""
+    for model in (OrderHourlyRollup, OrderStatusRollup, CategoryRollup, SearchTermDailyRollup):
+        await db.execute(delete(model))
     
-    active = await db.execute(
-        select(func.count(Business.id)).where(Business.is_active == True)
+    if db.get_bind().dialect.name == "postgresql":
+        hour = func.date_trunc("hour", Order.created_at)
+    else:
+        hour = func.strftime("%Y-%m-%d %H:00:00", Order.created_at)
+    result = await db.execute(
+        select(hour.label("bucket"), func.count(Order.id).label("count"))
+        .group_by(hour)
     )
-    active_count = active.scalar() or 0
+    for row in result.all():
+        db.add(OrderHourlyRollup(bucket=_as_datetime(row.bucket), count=row.count))
     
-    verified = await db.execute(
-        select(func.count(Business.id)).where(Business.is_verified == True)
+    result = await db.execute(
+        select(Order.status, func.count(Order.id).label("count"))
+        .group_by(Order.status)
     )
-    verified_count = verified.scalar() or 0
+    for row in result.all():
+        db.add(OrderStatusRollup(status=row.status, count=row.count))
+    
+    result = await db.execute(
+        select(
+            Business.category,
+            func.count(Business.id).label("total"),
+            func.sum(case((Business.is_active == True, 1), else_=0)).label("active"),
+            func.sum(case((Business.is_verified == True, 1), else_=0)).label("verified")
+        )
+        .group_by(Business.category)
+    )
+    for row in result.all():
+        db.add(CategoryRollup(
+            category=row.category,
+            total_count=row.total,
+            active_count=row.active or 0,
+            verified_count=row.verified or 0
+        ))
+    
+    day = func.date(AnalyticsEvent.timestamp)
+    result = await db.execute(
+        select(day.label("day"), AnalyticsEvent.search_term, func.count(AnalyticsEvent.id).label("count"))
+        .where(AnalyticsEvent.event_type == "search")
+        .where(AnalyticsEvent.search_term.isnot(None))
+        .group_by(day, AnalyticsEvent.search_term)
+    )
+    for row in result.all():
+        db.add(SearchTermDailyRollup(day=_as_date(row.day), search_term=row.search_term, count=row.count))
+    
+    await db.commit()
+
+
+async def ensure_rollups(db: AsyncSession) -> bool:
+    """Rebuild the rollups if their totals disagree with the raw tables.
+    
+    Runs once at startup, so data written outside the controllers (seed
+    scripts, manual edits) is picked up. Returns True if a rebuild ran.
+    """
+    checks = (
+        (select(func.count(Order.id)), select(func.coalesce(func.sum(OrderStatusRollup.count), 0))),
+        (select(func.count(Business.id)), select(func.coalesce(func.sum(CategoryRollup.total_count), 0))),
+        (
+            select(func.count(AnalyticsEvent.id))
+            .where(AnalyticsEvent.event_type == "search")
+            .where(AnalyticsEvent.search_term.isnot(None)),
+            select(func.coalesce(func.sum(SearchTermDailyRollup.count), 0))
+        ),
+    )
+    for raw_query, rollup_query in checks:
+        raw = (await db.execute(raw_query)).scalar()
+        rolled_up = (await db.execute(rollup_query)).scalar()
+        if raw != rolled_up:
+            await rebuild_rollups(db)
+            return True
+    return False
+
+
+async def get_business_stats(db: AsyncSession) -> Dict[str, int]:
+    """Get business statistics."""
+    result = await db.execute(
+        select(
+            func.coalesce(func.sum(CategoryRollup.total_count), 0).label("total"),
+            func.coalesce(func.sum(CategoryRollup.active_count), 0).label("active"),
+            func.coalesce(func.sum(CategoryRollup.verified_count), 0).label("verified")
+        )
+    )
+    row = result.one()
     
     return {
-        "total_businesses": total_count,
-        "active_businesses": active_count,
-        "verified_businesses": verified_count
+        "total_businesses": row.total,
+        "active_businesses": row.active,
+        "verified_businesses": row.verified
     }
 
 
 async def get_category_stats(db: AsyncSession) -> List[Dict[str, any]]:
     """Get statistics by category."""
-    # Get total businesses for percentage calculation
-    total_result = await db.execute(select(func.count(Business.id)))
-    total = total_result.scalar() or 1
-    
-    # Get count by category
     result = await db.execute(
-        select(Business.category, func.count(Business.id).label("count"))
-        .where(Business.is_active == True)
-        .group_by(Business.category)
-        .order_by(func.count(Business.id).desc())
+        select(CategoryRollup.category, CategoryRollup.total_count, CategoryRollup.active_count)
     )
+    rows = result.all()
+    
+    # Percentages are relative to all businesses, active or not
+    total = sum(row.total_count for row in rows) or 1
     
     stats = []
-    for row in result.all():
-        percentage = (row.count / total) * 100 if total > 0 else 0
+    for row in sorted(rows, key=lambda r: r.active_count, reverse=True):
+        if row.active_count <= 0:
+            continue
+        percentage = (row.active_count / total) * 100 if total > 0 else 0
         stats.append({
             "category": row.category,
-            "count": row.count,
+            "count": row.active_count,
             "percentage": round(percentage, 2)
         })
     
@@ -62,15 +245,11 @@ async def get_category_stats(db: AsyncSession) -> List[Dict[str, any]]:
 
 async def get_search_stats(db: AsyncSession, limit: int = 10) -> List[Dict[str, any]]:
     """Get top search terms."""
+    total = func.sum(SearchTermDailyRollup.count)
     result = await db.execute(
-        select(
-            AnalyticsEvent.search_term,
-            func.count(AnalyticsEvent.id).label("count")
-        )
-        .where(AnalyticsEvent.event_type == "search")
-        .where(AnalyticsEvent.search_term.isnot(None))
-        .group_by(AnalyticsEvent.search_term)
-        .order_by(func.count(AnalyticsEvent.id).desc())
+        select(SearchTermDailyRollup.search_term, total.label("count"))
+        .group_by(SearchTermDailyRollup.search_term)
+        .order_by(total.desc())
         .limit(limit)
     )
     
@@ -82,44 +261,33 @@ async def get_search_stats(db: AsyncSession, limit: int = 10) -> List[Dict[str,
 
 async def get_order_stats(db: AsyncSession) -> Dict[str, int]:
     """Get order statistics."""
-    total_result = await db.execute(select(func.count(Order.id)))
-    total = total_result.scalar() or 0
-    
-    # Orders by status
-    status_result = await db.execute(
-        select(Order.status, func.count(Order.id).label("count"))
-        .group_by(Order.status)
+    result = await db.execute(
+        select(OrderStatusRollup.status, OrderStatusRollup.count)
+        .where(OrderStatusRollup.count > 0)
     )
     
-    orders_by_status = {}
-    for row in status_result.all():
-        orders_by_status[row.status] = row.count
+    orders_by_status = {row.status: row.count for row in result.all()}
     
     return {
-        "total_orders": total,
+        "total_orders": sum(orders_by_status.values()),
         "orders_by_status": orders_by_status
     }
 
 
 async def get_time_stats(db: AsyncSession) -> List[Dict[str, any]]:
     """Get order statistics by hour of day."""
-    # Get orders from last 30 days
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+    # Hourly buckets from the last 30 days
+    thirty_days_ago = _hour_bucket(datetime.utcnow() - timedelta(days=30))
     
     result = await db.execute(
-        select(
-            extract("hour", Order.created_at).label("hour"),
-            func.count(Order.id).label("count")
-        )
-        .where(Order.created_at >= thirty_days_ago)
-        .group_by(extract("hour", Order.created_at))
-        .order_by(extract("hour", Order.created_at))
+        select(OrderHourlyRollup.bucket, OrderHourlyRollup.count)
+        .where(OrderHourlyRollup.bucket >= thirty_days_ago)
     )
     
     # Create a dict for all 24 hours, defaulting to 0
     hour_counts = {hour: 0 for hour in range(24)}
     for row in result.all():
-        hour_counts[int(row.hour)] = row.count
+        hour_counts[row.bucket.hour] += row.count
     
     return [
         {"hour": hour, "count": count}
@@ -143,4 +311,3 @@ async def get_dashboard_stats(db: AsyncSession) -> Dict[str, any]:
         "orders_by_status": order_stats.get("orders_by_status", {}),
         "total_orders": order_stats.get("total_orders", 0)
     }
-
@@ -7,7 +7,7 @@ from sqlmodel import select
 from fastapi import HTTPException, status
 
 from app.models.user import User
-from app.utils.auth import hash_password, verify_password, create_access_token
+from app.utils.auth import hash_password_async, verify_password_async, create_access_token
 
 
 async def register_user(
@@ -30,7 +30,7 @@ async def register_user(
         )
     
     # Create new user
-    password_hash = hash_password(password)
+    password_hash = await hash_password_async(password)
     user = User(
         email=email,
         password_hash=password_hash,
@@ -70,14 +70,14 @@ async def login_user(
         )
     
     # Verify password
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
     # Create access token
-    access_token = create_access_token(data={"sub": user.id})
+    access_token = create_access_token(data={"sub": str(user.id)})
     
     from app.schemas.auth import UserResponse
     
@@ -4,11 +4,16 @@ Business controller
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from sqlmodel import select
 from fastapi import HTTPException, status
 
 from app.models.business import Business, BusinessItem, BusinessPhoto
 from app.models.user import User
+from app.utils.search import index_business
+from app.utils.cache import response_cache, business_tags
+from app.utils.catalog import invalidate_catalog
+from app.controllers.analytics_controller import record_business_change, business_rollup_state
 
 
 async def create_business(
@@ -31,22 +36,30 @@ async def create_business(
     )
     
     db.add(business)
+    await db.flush()
+    await index_business(db, business.id)
+    await record_business_change(db, None, business_rollup_state(business))
     await db.commit()
-    await db.refresh(business)
+    response_cache.invalidate(*business_tags(business.id, business.category))
+    await db.refresh(business, ["items", "photos"])
     
     return business
 
 
 async def get_business(
     db: AsyncSession,
-    business_id: int
+    business_id: int,
+    with_details: bool = False
 ) -> Optional[Business]:
-    """Get a business by ID."""
-    result = await db.execute(
+    """Get a business by ID, optionally with its items and photos loaded."""
+    query = (
         select(Business)
         .where(Business.id == business_id)
         .where(Business.is_active == True)
     )
+    if with_details:
+        query = query.options(selectinload(Business.items), selectinload(Business.photos))
+    result = await db.execute(query)
     return result.scalar_one_or_none()
 
 
@@ -76,6 +89,8 @@ async def update_business(
             detail="Not authorized to update this business"
         )
     
+    before = business_rollup_state(business)
+    
     if name is not None:
         business.name = name
     if category is not None:
@@ -89,8 +104,20 @@ async def update_business(
     if is_active is not None:
         business.is_active = is_active
     
+    after = business_rollup_state(business)
+    await index_business(db, business.id)
+    await record_business_change(db, before, after)
     await db.commit()
-    await db.refresh(business)
+    
+    # Category listings only change when the business joins or leaves one
+    categories = (before[0], after[0]) if before[:2] != after[:2] else ()
+    listings = []
+    if name is not None or description is not None:
+        listings.append("search")
+    if location_zone is not None:
+        listings.append("zone")
+    response_cache.invalidate(*business_tags(business.id, *categories, listings=listings))
+    await db.refresh(business, ["items", "photos"])
     
     return business
 
@@ -109,12 +136,15 @@ async def verify_business(
             detail="Business not found"
         )
     
+    before = business_rollup_state(business)
     business.is_verified = True
     business.verified_at = datetime.utcnow()
     business.verified_by = admin_id
     
+    await record_business_change(db, before, business_rollup_state(business))
     await db.commit()
-    await db.refresh(business)
+    response_cache.invalidate(*business_tags(business.id, listings=["verified"]))
+    await db.refresh(business, ["items", "photos"])
     
     return business
 
@@ -139,8 +169,11 @@ async def delete_business(
             detail="Not authorized to delete this business"
         )
     
+    before = business_rollup_state(business)
     business.is_active = False
+    await record_business_change(db, before, business_rollup_state(business))
     await db.commit()
+    response_cache.invalidate(*business_tags(business.id, business.category))
 
 
 async def add_business_item(
@@ -178,7 +211,10 @@ async def add_business_item(
     )
     
     db.add(item)
+    await index_business(db, business_id)
     await db.commit()
+    response_cache.invalidate(*business_tags(business_id, listings=["search"]))
+    invalidate_catalog(business_id)
     await db.refresh(item)
     
     return item
@@ -232,7 +268,10 @@ async def update_business_item(
     if is_available is not None:
         item.is_available = is_available
     
+    await index_business(db, business_id)
     await db.commit()
+    response_cache.invalidate(*business_tags(business_id, listings=["search"]))
+    invalidate_catalog(business_id)
     await db.refresh(item)
     
     return item
@@ -271,7 +310,10 @@ async def delete_business_item(
         )
     
     await db.delete(item)
+    await index_business(db, business_id)
     await db.commit()
+    response_cache.invalidate(*business_tags(business_id, listings=["search"]))
+    invalidate_catalog(business_id)
 
 
 async def upload_business_photo(
@@ -316,6 +358,7 @@ async def upload_business_photo(
     
     db.add(photo)
     await db.commit()
+    response_cache.invalidate(f"business:{business_id}")
     await db.refresh(photo)
     
     return photo
@@ -355,4 +398,5 @@ async def delete_business_photo(
     
     await db.delete(photo)
     await db.commit()
+    response_cache.invalidate(f"business:{business_id}")
 
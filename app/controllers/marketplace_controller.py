@@ -1,15 +1,36 @@
 """
 Marketplace listing controller
 """
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Tuple, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlmodel import select, or_
 from sqlalchemy import func
 
 from app.models.business import Business, BusinessItem, BusinessPhoto
-from app.models.analytics import AnalyticsEvent
-from app.utils.distance import filter_by_distance
+from app.utils.analytics_buffer import analytics_buffer
+from app.utils.distance import zone_filter
+from app.utils.search import fts_enabled, build_fts_query, fts_match_subquery
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    encode_cursor,
+    decode_cursor,
+    keyset_predicate
+)
+
+
+def _primary_photo_column():
+    """Correlated subquery returning a business's primary (or first) photo URL."""
+    return (
+        select(BusinessPhoto.image_url)
+        .where(BusinessPhoto.business_id == Business.id)
+        .order_by(BusinessPhoto.is_primary.desc(), BusinessPhoto.id)
+        .limit(1)
+        .correlate(Business)
+        .scalar_subquery()
+        .label("primary_photo")
+    )
 
 
 async def list_businesses(
@@ -18,56 +39,136 @@ async def list_businesses(
     verified: Optional[bool] = None,
     distance: Optional[str] = None,  # "200m" or "500m"
     search: Optional[str] = None,
-    user_zone: Optional[str] = None
-) -> List[Business]:
-    """List businesses with filters."""
-    query = (
-        select(Business)
-        .where(Business.is_active == True)
-        .options(
+    user_zone: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    lean: bool = False,
+    sort: str = "newest",  # "newest" or "rating"
+    min_rating: Optional[float] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """List businesses with filters, one page at a time.
+
+    Pages are ordered newest first by (created_at, id), by relevance when
+    the search goes through the full-text index, or by average rating when
+    sort="rating". In lean mode only the listing columns and the primary
+    photo URL are loaded.
+
+    Returns the page and the cursor of the next page (None on the last page).
+    """
+    if lean:
+        query = select(
+            Business.id,
+            Business.name,
+            Business.category,
+            Business.location_zone,
+            Business.is_verified,
+            Business.description,
+            Business.created_at,
+            Business.rating_avg,
+            Business.rating_count,
+            _primary_photo_column()
+        )
+    else:
+        query = select(Business).options(
             selectinload(Business.items),
             selectinload(Business.photos)
         )
-    )
-    
+    query = query.where(Business.is_active == True)
+
     # Category filter
     if category:
         query = query.where(Business.category == category)
-    
+
     # Verified filter
     if verified is not None:
         query = query.where(Business.is_verified == verified)
     
+    # Rating filter (uses the rating_avg index)
+    if min_rating is not None:
+        query = query.where(Business.rating_avg >= min_rating)
+
+    # Distance filter, resolved to the set of zones in range
+    if distance and user_zone:
+        max_distance = float(distance.replace("m", ""))
+        query = query.where(zone_filter(Business.location_zone, user_zone, max_distance))
+    
+    ranked = False
+
     # Search filter
     if search:
-        search_term = f"%{search.lower()}%"
-        query = query.where(
-            or_(
-                func.lower(Business.name).like(search_term),
-                func.lower(Business.description).like(search_term)
+        fts_query = build_fts_query(search) if fts_enabled(db) else None
+        if fts_query:
+            # Ranked full-text match over name, description, category and items
+            matches = fts_match_subquery(fts_query)
+            query = (
+                query
+                .join(matches, matches.c.business_id == Business.id)
+                .add_columns(matches.c.rank.label("search_rank"))
             )
-        )
-        
-        # Track search for analytics
-        event = AnalyticsEvent(
-            event_type="search",
-            search_term=search,
-            category=category
-        )
-        db.add(event)
-        await db.commit()
-    
+            ranked = True
+        else:
+            search_term = f"%{search.lower()}%"
+            query = query.where(
+                or_(
+                    func.lower(Business.name).like(search_term),
+                    func.lower(Business.description).like(search_term)
+                )
+            )
+
+        # Track search for analytics (first page only)
+        if not cursor:
+            await track_search(search, category)
+
+    # Keyset pagination: highest rated first when asked, otherwise best
+    # match first when ranked, otherwise newest first
+    if sort == "rating":
+        sort_columns = (Business.rating_avg, Business.id)
+        cursor_parsers = (float, int)
+        descending = True
+    elif ranked:
+        sort_columns = (matches.c.rank, Business.id)
+        cursor_parsers = (float, int)
+        descending = False
+    else:
+        sort_columns = (Business.created_at, Business.id)
+        cursor_parsers = (datetime.fromisoformat, int)
+        descending = True
+
+    if cursor:
+        after = decode_cursor(cursor, cursor_parsers)
+        query = query.where(keyset_predicate(sort_columns, after, descending))
+
+    order_by = [c.desc() for c in sort_columns] if descending else list(sort_columns)
+    query = query.order_by(*order_by).limit(limit + 1)
+
     result = await db.execute(query)
-    businesses = result.scalars().all()
-    
-    # Distance filter (after fetching)
-    if distance and user_zone:
-        max_distance = float(distance.replace("m", ""))
-        business_zones = [(b.id, b.location_zone) for b in businesses]
-        filtered_ids = filter_by_distance(user_zone, business_zones, max_distance)
-        businesses = [b for b in businesses if b.id in filtered_ids]
-    
-    return businesses
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        record = last if lean else last[0]
+        if sort == "rating":
+            sort_key = record.rating_avg
+        elif ranked:
+            sort_key = last.search_rank
+        else:
+            sort_key = record.created_at
+        next_cursor = encode_cursor(sort_key, record.id)
+
+    businesses = rows if lean else [row[0] for row in rows]
+
+    return businesses, next_cursor
+
+
+async def track_search(search: str, category: Optional[str] = None) -> None:
+    """Track a marketplace search for analytics."""
+    await analytics_buffer.record(
+        event_type="search",
+        search_term=search,
+        category=category
+    )
 
 
 async def track_business_view(
@@ -76,11 +177,8 @@ async def track_business_view(
     category: Optional[str] = None
 ) -> None:
     """Track a business view for analytics."""
-    event = AnalyticsEvent(
+    await analytics_buffer.record(
         event_type="business_view",
         business_id=business_id,
         category=category
     )
-    db.add(event)
-    await db.commit()
-
@@ -1,16 +1,74 @@
 """
 Order controller
 """
+from collections import Counter
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, FrozenSet, Tuple
+from sqlalchemy import and_, insert, or_, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 from fastapi import HTTPException, status
 
-from app.models.order import Order, OrderMessage
+from app.models.order import Order, OrderLine, OrderMessage
 from app.models.business import Business
 from app.models.user import User
-from app.models.analytics import AnalyticsEvent
+from app.utils.analytics_buffer import analytics_buffer
+from app.controllers.analytics_controller import record_order_created, record_order_status_change
+from app.utils.pubsub import order_events
+from app.utils.pagination import DEFAULT_PAGE_SIZE, encode_cursor, decode_cursor, keyset_predicate
+from app.utils.catalog import Catalog, get_catalog
+
+ORDER_STATUSES = ["pending", "accepted", "ready_for_pickup", "delivered", "completed"]
+
+# Allowed status changes: (from, to) -> who may make them. Admins may make any of them.
+ORDER_TRANSITIONS: Dict[Tuple[str, str], FrozenSet[str]] = {
+    ("pending", "accepted"): frozenset({"seller"}),
+    ("accepted", "ready_for_pickup"): frozenset({"seller"}),
+    ("accepted", "delivered"): frozenset({"seller"}),
+    ("ready_for_pickup", "delivered"): frozenset({"seller"}),
+    ("ready_for_pickup", "completed"): frozenset({"buyer", "seller"}),
+    ("delivered", "completed"): frozenset({"buyer", "seller"}),
+}
+
+
+def _check_status(order_status: str) -> None:
+    if order_status not in ORDER_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status. Must be one of: {', '.join(ORDER_STATUSES)}"
+        )
+
+
+def order_total(items: List[Dict[str, Any]]) -> float:
+    """Total of an order's lines."""
+    return round(sum(item["quantity"] * item["price"] for item in items), 2)
+
+
+def price_order_items(catalog: Catalog, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Check items against a business's catalog and price them from it.
+    
+    The catalog price is authoritative; prices sent by the client are ignored.
+    """
+    priced = []
+    for item in items:
+        entry = catalog.get(item["item_id"])
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Item {item['item_id']} is not sold by this business"
+            )
+        if not entry.is_available:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Item {item['item_id']} is not available"
+            )
+        if item["quantity"] < 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Quantity must be at least 1"
+            )
+        priced.append({"item_id": item["item_id"], "quantity": item["quantity"], "price": entry.price})
+    return priced
 
 
 async def create_order(
@@ -31,27 +89,40 @@ async def create_order(
             detail="Business not found"
         )
     
-    # Create order
+    # Validate and price the items in memory from the business's catalog
+    items = price_order_items(await get_catalog(db, business_id), items)
+    
+    # Create the order with its precomputed total, then its lines in one insert
     order = Order(
         business_id=business_id,
         buyer_id=buyer_id,
-        items=items,
+        total_amount=order_total(items),
         notes=notes,
         status="pending"
     )
     
     db.add(order)
+    await db.flush()
+    if items:
+        await db.execute(insert(OrderLine), [
+            {
+                "order_id": order.id,
+                "item_id": item["item_id"],
+                "quantity": item["quantity"],
+                "price": item["price"]
+            }
+            for item in items
+        ])
+    await record_order_created(db, order)
     await db.commit()
     await db.refresh(order)
     
     # Track order creation for analytics
-    event = AnalyticsEvent(
+    await analytics_buffer.record(
         event_type="order_created",
         business_id=business_id,
         category=business.category
     )
-    db.add(event)
-    await db.commit()
     
     return order
 
@@ -78,82 +149,267 @@ async def get_order(
 async def list_orders(
     db: AsyncSession,
     user_id: int,
-    role: str = "resident"
-) -> List[Order]:
-    """List orders for a user."""
+    role: str = "resident",
+    order_status: Optional[str] = None,
+    business_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None
+) -> Tuple[List[Order], Optional[str]]:
+    """List a page of orders for a user, newest first.
+    
+    Admins see every order; residents see the orders they placed and the
+    orders placed with their businesses. created_from is inclusive and
+    created_to exclusive. Returns the orders and the cursor for the next
+    page (None on the last page).
+    """
+    filters = []
+    if order_status is not None:
+        _check_status(order_status)
+        filters.append(Order.status == order_status)
+    if business_id is not None:
+        filters.append(Order.business_id == business_id)
+    if created_from is not None:
+        filters.append(Order.created_at >= created_from)
+    if created_to is not None:
+        filters.append(Order.created_at < created_to)
+    if cursor:
+        after = decode_cursor(cursor, (datetime.fromisoformat, int))
+        filters.append(keyset_predicate((Order.created_at, Order.id), after))
+    
+    newest = (Order.created_at.desc(), Order.id.desc())
     if role == "admin":
         # Admins can see all orders
-        result = await db.execute(select(Order))
+        query = select(Order).where(*filters)
     else:
-        # Residents see their own orders or orders for their businesses
-        result = await db.execute(
-            select(Order).where(
-                (Order.buyer_id == user_id) |
-                (Order.business_id.in_(
-                    select(Business.id).where(Business.owner_id == user_id)
-                ))
-            )
+        # Orders the user placed, then orders placed with each of the user's
+        # businesses. Each branch walks its own index newest first and stops
+        # after a page, so only those rows are sorted together.
+        owned_query = select(Business.id).where(Business.owner_id == user_id)
+        if business_id is not None:
+            owned_query = owned_query.where(Business.id == business_id)
+        owned = (await db.execute(owned_query)).scalars().all()
+        
+        branches = [select(Order.id).where(Order.buyer_id == user_id, *filters)]
+        branches.extend(
+            select(Order.id)
+            .where(Order.business_id == owned_id, Order.buyer_id != user_id, *filters)
+            for owned_id in owned
         )
+        pages = []
+        for branch in branches:
+            page = branch.order_by(*newest).limit(limit + 1).subquery()
+            pages.append(select(page.c.id))
+        query = select(Order).where(Order.id.in_(union_all(*pages) if len(pages) > 1 else pages[0]))
+    
+    query = query.order_by(*newest).limit(limit + 1)
+    orders = (await db.execute(query)).scalars().all()
     
-    return result.scalars().all()
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+    return orders, next_cursor
 
 
-async def update_order_status(
-    db: AsyncSession,
-    order_id: int,
+def allowed_from(new_status: str, actor: str) -> List[str]:
+    """Statuses an actor (buyer, seller or admin) may move an order to new_status from."""
+    return [
+        old for (old, new), actors in ORDER_TRANSITIONS.items()
+        if new == new_status and (actor == "admin" or actor in actors)
+    ]
+
+
+def _transition_condition(new_status: str, user_id: int, role: str):
+    """WHERE clause matching orders the user may move to new_status right now."""
+    if role == "admin":
+        return Order.status.in_(allowed_from(new_status, "admin"))
+    
+    owned = select(Business.id).where(Business.owner_id == user_id)
+    return or_(
+        and_(Order.buyer_id == user_id, Order.status.in_(allowed_from(new_status, "buyer"))),
+        and_(Order.business_id.in_(owned), Order.status.in_(allowed_from(new_status, "seller")))
+    )
+
+
+def _transition_error(
+    order: Optional[Order],
+    owner_id: Optional[int],
     new_status: str,
     user_id: int,
-    role: str = "resident"
-) -> Order:
-    """Update order status."""
-    order = await get_order(db, order_id, user_id)
-    
-    if not order:
-        raise HTTPException(
+    role: str,
+    version: Optional[int] = None
+) -> HTTPException:
+    """Explain why a conditional status update matched no row."""
+    if order is None or (role != "admin" and user_id not in (order.buyer_id, owner_id)):
+        return HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
         )
     
-    # Verify user has permission (buyer or business owner)
-    result = await db.execute(select(Business).where(Business.id == order.business_id))
-    business = result.scalar_one_or_none()
-    
-    can_update = (
-        order.buyer_id == user_id or
-        (business and business.owner_id == user_id) or
-        role == "admin"
+    stale = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Order was updated by someone else; reload it and try again"
     )
+    if version is not None and order.version != version:
+        return stale
     
-    if not can_update:
-        raise HTTPException(
+    actors = ORDER_TRANSITIONS.get((order.status, new_status))
+    if actors is None:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot change order status from {order.status} to {new_status}"
+        )
+    
+    allowed = role == "admin" or (
+        (order.buyer_id == user_id and "buyer" in actors) or
+        (owner_id == user_id and "seller" in actors)
+    )
+    if not allowed:
+        return HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this order"
+            detail="Not authorized to make this status change"
         )
     
-    # Validate status transition
-    valid_statuses = ["pending", "accepted", "ready_for_pickup", "delivered", "completed"]
-    if new_status not in valid_statuses:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+    # The order changed between the update and this read
+    return stale
+
+
+def _status_update(new_status: str, user_id: int, role: str, *conditions):
+    """UPDATE ... RETURNING moving the matching orders the user may change.
+    
+    SET expressions see the old row, so previous_status gets the old status.
+    """
+    return (
+        update(Order)
+        .where(*conditions, _transition_condition(new_status, user_id, role))
+        .values(
+            previous_status=Order.status,
+            status=new_status,
+            version=Order.version + 1,
+            updated_at=datetime.utcnow()
         )
+        .returning(Order)
+        .execution_options(populate_existing=True)
+    )
+
+
+async def _orders_with_owner(db: AsyncSession, order_ids: List[int]) -> Dict[int, Tuple[Order, int]]:
+    """Orders by ID with the owner of their business, for explaining failures."""
+    result = await db.execute(
+        select(Order, Business.owner_id)
+        .join(Business, Business.id == Order.business_id)
+        .where(Order.id.in_(order_ids))
+    )
+    return {order.id: (order, owner_id) for order, owner_id in result.all()}
+
+
+def _publish_status(order: Order) -> None:
+    order_events.publish(order.id, "status", {
+        "order_id": order.id,
+        "status": order.status,
+        "version": order.version,
+        "updated_at": order.updated_at
+    })
+
+
+async def update_order_status(
+    db: AsyncSession,
+    order_id: int,
+    new_status: str,
+    user_id: int,
+    role: str = "resident",
+    version: Optional[int] = None
+) -> Order:
+    """Move an order to a new status.
+    
+    Permission, transition and version checks are all part of one conditional
+    UPDATE, so concurrent changes cannot overwrite each other. Only when it
+    matches no row is the order read, to report why.
+    """
+    _check_status(new_status)
+    
+    conditions = [Order.id == order_id]
+    if version is not None:
+        conditions.append(Order.version == version)
+    
+    result = await db.execute(_status_update(new_status, user_id, role, *conditions))
+    order = result.scalar_one_or_none()
     
-    order.status = new_status
-    order.updated_at = datetime.utcnow()
+    if order is None:
+        order, owner_id = (await _orders_with_owner(db, [order_id])).get(order_id, (None, None))
+        raise _transition_error(order, owner_id, new_status, user_id, role, version)
     
+    await record_order_status_change(db, order.previous_status, order.status)
     await db.commit()
-    await db.refresh(order)
+    
+    _publish_status(order)
     
     return order
 
 
+async def bulk_update_order_status(
+    db: AsyncSession,
+    order_ids: List[int],
+    new_status: str,
+    user_id: int,
+    role: str = "resident"
+) -> List[Dict[str, Any]]:
+    """Move several orders to a new status with one set-based UPDATE.
+    
+    Orders the user may not move are left unchanged; they are read in one
+    query to explain why. Returns a result per order ID, in request order,
+    with the HTTP status code and detail a single update would have given.
+    """
+    _check_status(new_status)
+    
+    order_ids = list(dict.fromkeys(order_ids))
+    result = await db.execute(_status_update(new_status, user_id, role, Order.id.in_(order_ids)))
+    updated = {order.id: order for order in result.scalars().all()}
+    
+    moved = Counter(order.previous_status for order in updated.values())
+    for old_status, count in moved.items():
+        await record_order_status_change(db, old_status, new_status, orders=count)
+    
+    failed = [order_id for order_id in order_ids if order_id not in updated]
+    existing = await _orders_with_owner(db, failed) if failed else {}
+    
+    await db.commit()
+    
+    results = []
+    for order_id in order_ids:
+        order = updated.get(order_id)
+        if order is not None:
+            _publish_status(order)
+            results.append({
+                "order_id": order_id,
+                "status_code": status.HTTP_200_OK,
+                "status": order.status,
+                "version": order.version,
+                "detail": None
+            })
+        else:
+            order, owner_id = existing.get(order_id, (None, None))
+            error = _transition_error(order, owner_id, new_status, user_id, role)
+            results.append({
+                "order_id": order_id,
+                "status_code": error.status_code,
+                "status": None,
+                "version": None,
+                "detail": error.detail
+            })
+    return results
+
+
 async def send_order_message(
     db: AsyncSession,
     order_id: int,
     sender_id: int,
-    message: str
+    message: str,
+    sender_name: Optional[str] = None
 ) -> OrderMessage:
-    """Send a message in an order chat."""
+    """Send a message in an order chat and publish it to live subscribers."""
     order = await get_order(db, order_id, sender_id)
     
     if not order:
@@ -187,15 +443,30 @@ async def send_order_message(
     await db.commit()
     await db.refresh(order_message)
     
+    order_events.publish(order_id, "message", {
+        "id": order_message.id,
+        "order_id": order_message.order_id,
+        "sender_id": order_message.sender_id,
+        "sender_name": sender_name,
+        "message": order_message.message,
+        "created_at": order_message.created_at
+    })
+    
     return order_message
 
 
 async def get_order_messages(
     db: AsyncSession,
     order_id: int,
-    user_id: int
-) -> List[OrderMessage]:
-    """Get messages for an order."""
+    user_id: int,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[Tuple[OrderMessage, str]], Optional[int]]:
+    """Get a page of an order's messages with sender names, oldest first.
+    
+    Checks that the user can see the order, then returns get_message_page.
+    """
     order = await get_order(db, order_id, user_id)
     
     if not order:
@@ -204,11 +475,66 @@ async def get_order_messages(
             detail="Order not found"
         )
     
-    result = await db.execute(
-        select(OrderMessage)
+    return await get_message_page(db, order_id, before_id=before_id, after_id=after_id, limit=limit)
+
+
+async def get_message_page(
+    db: AsyncSession,
+    order_id: int,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[Tuple[OrderMessage, str]], Optional[int]]:
+    """Get a page of an order's messages with sender names, oldest first.
+    
+    Without after_id this is the newest page (before before_id, if given)
+    and the returned cursor is the before_id of the next older page. With
+    after_id it is the page right after that message, and the cursor is the
+    after_id of the next newer page. The cursor is None when there are no
+    more messages in that direction.
+    
+    Does not check access; callers must have loaded the order with get_order.
+    """
+    query = (
+        select(OrderMessage, User.full_name)
+        .join(User, User.id == OrderMessage.sender_id)
         .where(OrderMessage.order_id == order_id)
-        .order_by(OrderMessage.created_at)
     )
+    if before_id is not None:
+        query = query.where(OrderMessage.id < before_id)
+    if after_id is not None:
+        query = query.where(OrderMessage.id > after_id)
     
-    return result.scalars().all()
+    # Walk the (order_id, id) index from the cursor, one row past the page
+    forward = after_id is not None
+    query = query.order_by(OrderMessage.id if forward else OrderMessage.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
+    
+    next_cursor = None
+    if has_more:
+        next_cursor = rows[-1][0].id if forward else rows[0][0].id
+    return rows, next_cursor
+
 
+async def get_order_messages_since(
+    db: AsyncSession,
+    order_id: int,
+    since_id: int
+) -> List[Tuple[OrderMessage, str]]:
+    """Get messages newer than since_id with sender names.
+    
+    Does not check access; callers must have loaded the order with get_order.
+    """
+    result = await db.execute(
+        select(OrderMessage, User.full_name)
+        .join(User, User.id == OrderMessage.sender_id)
+        .where(OrderMessage.order_id == order_id)
+        .where(OrderMessage.id > since_id)
+        .order_by(OrderMessage.id)
+    )
+    return result.all()
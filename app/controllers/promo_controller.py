@@ -4,11 +4,12 @@ Promo controller
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, func
 from fastapi import HTTPException, status
 
 from app.models.promo import Promo
 from app.models.business import Business
+from app.utils.cache import response_cache
 
 
 async def create_promo(
@@ -47,6 +48,7 @@ async def create_promo(
     
     db.add(promo)
     await db.commit()
+    response_cache.invalidate("promos")
     await db.refresh(promo)
     
     return promo
@@ -76,6 +78,21 @@ async def list_promos(
     return result.scalars().all()
 
 
+async def seconds_until_next_promo_change(db: AsyncSession) -> Optional[float]:
+    """Seconds until a promo starts or ends, or None if none is scheduled."""
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(
+            select(func.min(Promo.start_date)).where(Promo.start_date > now).scalar_subquery(),
+            select(func.min(Promo.end_date)).where(Promo.end_date >= now).scalar_subquery()
+        )
+    )
+    upcoming = [moment for moment in result.one() if moment is not None]
+    if not upcoming:
+        return None
+    return (min(upcoming) - now).total_seconds()
+
+
 async def update_promo(
     db: AsyncSession,
     promo_id: int,
@@ -111,6 +128,7 @@ async def update_promo(
         promo.end_date = end_date
     
     await db.commit()
+    response_cache.invalidate("promos")
     await db.refresh(promo)
     
     return promo
@@ -133,4 +151,5 @@ async def delete_promo(
     
     await db.delete(promo)
     await db.commit()
+    response_cache.invalidate("promos")
 
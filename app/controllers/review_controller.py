@@ -3,12 +3,49 @@ Review controller
 """
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select
+from sqlmodel import select, update
+from sqlalchemy import case
 from fastapi import HTTPException, status
 
 from app.models.review import Review
 from app.models.order import Order
 from app.models.business import Business
+from app.utils.cache import response_cache, business_tags
+
+
+async def record_rating(
+    db: AsyncSession,
+    business_id: int,
+    rating: int,
+    sign: int
+) -> None:
+    """Add (sign=1) or remove (sign=-1) a rating from a business's aggregates.
+    
+    A single UPDATE relative to the stored values, so concurrent reviews
+    cannot overwrite each other's counts.
+    """
+    new_sum = Business.rating_sum + sign * rating
+    new_count = Business.rating_count + sign
+    bucket = getattr(Business, f"rating_{rating}")
+    await db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values({
+            Business.rating_sum: new_sum,
+            Business.rating_count: new_count,
+            bucket: bucket + sign,
+            Business.rating_avg: case(
+                (new_count > 0, new_sum * 1.0 / new_count),
+                else_=0.0
+            )
+        })
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _invalidate_reviews(business_id: int, rating_changed: bool) -> None:
+    listings = ["rating"] if rating_changed else []
+    response_cache.invalidate(f"reviews:{business_id}", *business_tags(business_id, listings=listings))
 
 
 async def create_review(
@@ -63,7 +100,9 @@ async def create_review(
     )
     
     db.add(review)
+    await record_rating(db, review.business_id, rating, 1)
     await db.commit()
+    _invalidate_reviews(review.business_id, True)
     await db.refresh(review)
     
     return review
@@ -98,8 +137,11 @@ async def delete_review(
             detail="Review not found"
         )
     
+    if review.is_visible:
+        await record_rating(db, review.business_id, review.rating, -1)
     await db.delete(review)
     await db.commit()
+    _invalidate_reviews(review.business_id, review.is_visible)
 
 
 async def moderate_review(
@@ -118,8 +160,12 @@ async def moderate_review(
             detail="Review not found"
         )
     
+    rating_changed = review.is_visible != is_visible
+    if rating_changed:
+        await record_rating(db, review.business_id, review.rating, 1 if is_visible else -1)
     review.is_visible = is_visible
     await db.commit()
+    _invalidate_reviews(review.business_id, rating_changed)
     await db.refresh(review)
     
     return review
@@ -1,10 +1,14 @@
 """
 Database configuration and session management
 """
+import logging
 import os
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Optional
 
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlmodel import SQLModel
 
@@ -15,13 +19,23 @@ from app.models import (
     BusinessItem,
     BusinessPhoto,
     Order,
+    OrderLine,
     OrderMessage,
     Review,
     Promo,
     AnalyticsEvent,
+    OrderHourlyRollup,
+    OrderStatusRollup,
+    CategoryRollup,
+    SearchTermDailyRollup,
 )
+from app.utils.search import create_search_index
+from app.utils.metrics import timed_pool_class
+from app.utils.sql_stats import SQL_INSTRUMENTATION, instrument_engine
 
 
+logger = logging.getLogger(__name__)
+
 # Determine database path
 if os.path.exists("/data"):
     # Production on Fly.io - use volume
@@ -36,20 +50,121 @@ DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite+aiosqlite:///{DB_PATH}")
 
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# Read-only traffic (browsing, reviews, promos, dashboard) goes through a
+# separate engine. Defaults to a read-only view of DATABASE_URL.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "5"))
+
+# Log every SQL statement (development only)
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+
+# SQLite connection profile, applied to every new connection. WAL lets
+# readers run alongside the single writer; synchronous=NORMAL is safe in
+# WAL mode and avoids an fsync per commit.
+SQLITE_PRAGMAS: Dict[str, str] = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-32000"),  # negative = KiB
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024)),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the SQLite connection profile to a new DBAPI connection."""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _apply_sqlite_reader_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the connection profile to a read-only SQLite connection.
+    
+    The journal mode is a property of the database file and is set by the
+    writer; a read-only connection cannot change it.
+    """
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        if name != "journal_mode":
+            cursor.execute(f"PRAGMA {name}={value}")
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def _sqlite_read_only_url(url: str) -> Optional[str]:
+    """Turn a file-backed SQLite URL into a mode=ro URI, or None if in-memory."""
+    parsed = make_url(url)
+    database = parsed.database
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+    return parsed.set(
+        database=f"file:{database}",
+        query={**parsed.query, "mode": "ro", "uri": "true"}
+    ).render_as_string(hide_password=False)
+
+
+def _default_pool_class(url: str):
+    """The pool class SQLAlchemy would pick for a URL."""
+    parsed = make_url(url)
+    return parsed.get_dialect().get_pool_class(parsed)
+
+
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    echo=SQL_ECHO,
+    poolclass=timed_pool_class(_default_pool_class(DATABASE_URL)),
+    pool_logging_name="writer",
+    connect_args={"check_same_thread": False} if IS_SQLITE else {}
 )
 
-# Create session factory
+if IS_SQLITE:
+    event.listen(engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+# Create read-only engine; an in-memory SQLite database cannot be shared
+# across connections, so reads stay on the writer engine in that case
+if DATABASE_READ_URL:
+    read_url = DATABASE_READ_URL
+elif IS_SQLITE:
+    read_url = _sqlite_read_only_url(DATABASE_URL)
+else:
+    read_url = DATABASE_URL
+
+if read_url:
+    read_engine = create_async_engine(
+        read_url,
+        echo=SQL_ECHO,
+        poolclass=timed_pool_class(AsyncAdaptedQueuePool),
+        pool_size=DB_READ_POOL_SIZE,
+        pool_logging_name="reader",
+        connect_args={"check_same_thread": False} if read_url.startswith("sqlite") else {}
+    )
+    if read_url.startswith("sqlite"):
+        event.listen(read_engine.sync_engine, "connect", _apply_sqlite_reader_pragmas)
+else:
+    read_engine = engine
+
+if SQL_INSTRUMENTATION:
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+
+# Create session factories
 async_session = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False
 )
 
+async_read_session = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session."""
@@ -57,8 +172,36 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get a read-only database session for GET endpoints."""
+    async with async_read_session() as session:
+        yield session
+
+
+async def report_database_settings() -> Dict[str, str]:
+    """Log the effective database settings, read back from a live connection."""
+    settings = {
+        "url": engine.url.render_as_string(hide_password=True),
+        "read_url": read_engine.url.render_as_string(hide_password=True),
+        "echo": str(SQL_ECHO)
+    }
+    
+    if IS_SQLITE:
+        async with engine.connect() as conn:
+            for name in SQLITE_PRAGMAS:
+                value = (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                settings[name] = str(value)
+    
+    logger.info(
+        "Database settings: %s",
+        ", ".join(f"{name}={value}" for name, value in settings.items())
+    )
+    return settings
+
+
 async def init_db() -> None:
     """Initialize database and create tables."""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(create_search_index)
 
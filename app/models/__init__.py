@@ -3,10 +3,16 @@ Database models
 """
 from app.models.user import User
 from app.models.business import Business, BusinessItem, BusinessPhoto
-from app.models.order import Order, OrderMessage
+from app.models.order import Order, OrderLine, OrderMessage
 from app.models.review import Review
 from app.models.promo import Promo
-from app.models.analytics import AnalyticsEvent
+from app.models.analytics import (
+    AnalyticsEvent,
+    OrderHourlyRollup,
+    OrderStatusRollup,
+    CategoryRollup,
+    SearchTermDailyRollup,
+)
 
 __all__ = [
     "User",
@@ -14,8 +20,13 @@ __all__ = [
     "BusinessItem",
     "BusinessPhoto",
     "Order",
+    "OrderLine",
     "OrderMessage",
     "Review",
     "Promo",
     "AnalyticsEvent",
+    "OrderHourlyRollup",
+    "OrderStatusRollup",
+    "CategoryRollup",
+    "SearchTermDailyRollup",
 ]
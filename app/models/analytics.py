@@ -1,7 +1,7 @@
 """
 Analytics model
 """
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field
 
@@ -15,3 +15,30 @@ class AnalyticsEvent(SQLModel, table=True):
     search_term: Optional[str] = None  # For search events
     timestamp: datetime = Field(default_factory=datetime.utcnow, index=True)
 
+
+
+class OrderHourlyRollup(SQLModel, table=True):
+    """Orders created per hour (UTC, truncated to the hour)."""
+    bucket: datetime = Field(primary_key=True)
+    count: int = Field(default=0)
+
+
+class OrderStatusRollup(SQLModel, table=True):
+    """Current number of orders in each status."""
+    status: str = Field(primary_key=True)
+    count: int = Field(default=0)
+
+
+class CategoryRollup(SQLModel, table=True):
+    """Business counts per category."""
+    category: str = Field(primary_key=True)
+    total_count: int = Field(default=0)
+    active_count: int = Field(default=0)
+    verified_count: int = Field(default=0)
+
+
+class SearchTermDailyRollup(SQLModel, table=True):
+    """Search counts per term per day."""
+    day: date = Field(primary_key=True)
+    search_term: str = Field(primary_key=True)
+    count: int = Field(default=0)
@@ -2,17 +2,22 @@
 Business models
 """
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
-from sqlalchemy import JSON as SQLJSON
+from sqlalchemy import JSON as SQLJSON, Index
 
 
 class Business(SQLModel, table=True):
     """Business model for home-based businesses."""
+    __table_args__ = (
+        # Marketplace listing: active businesses, newest first
+        Index("ix_business_active_created", "is_active", "created_at"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
-    owner_id: int = Field(foreign_key="user.id")
+    owner_id: int = Field(foreign_key="user.id", index=True)
     name: str
-    category: str  # Food, Services, Repairs, Rentals, Crafts, Beauty, etc.
+    category: str = Field(index=True)  # Food, Services, Repairs, Rentals, Crafts, Beauty, etc.
     operating_hours: Optional[str] = None  # e.g., "Mon-Fri 9AM-5PM"
     location_zone: Optional[str] = None  # Zone/purok only, no exact address
     description: Optional[str] = None
@@ -22,6 +27,16 @@ class Business(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     is_active: bool = Field(default=True)
     
+    # Rating aggregates over visible reviews, maintained by review_controller
+    rating_sum: int = Field(default=0)
+    rating_count: int = Field(default=0)
+    rating_avg: float = Field(default=0.0, index=True)
+    rating_1: int = Field(default=0)
+    rating_2: int = Field(default=0)
+    rating_3: int = Field(default=0)
+    rating_4: int = Field(default=0)
+    rating_5: int = Field(default=0)
+    
     # Relationships
     owner: "User" = Relationship(
         back_populates="businesses",
@@ -36,12 +51,17 @@ class Business(SQLModel, table=True):
     orders: List["Order"] = Relationship(back_populates="business")
     reviews: List["Review"] = Relationship(back_populates="business")
     promos: List["Promo"] = Relationship(back_populates="business")
+    
+    @property
+    def rating_histogram(self) -> Dict[int, int]:
+        """Number of visible reviews per star rating."""
+        return {stars: getattr(self, f"rating_{stars}") for stars in range(1, 6)}
 
 
 class BusinessItem(SQLModel, table=True):
     """Menu/Service items for businesses."""
     id: Optional[int] = Field(default=None, primary_key=True)
-    business_id: int = Field(foreign_key="business.id")
+    business_id: int = Field(foreign_key="business.id", index=True)
     name: str
     description: Optional[str] = None
     price: float
@@ -55,7 +75,7 @@ class BusinessItem(SQLModel, table=True):
 class BusinessPhoto(SQLModel, table=True):
     """Photos for businesses."""
     id: Optional[int] = Field(default=None, primary_key=True)
-    business_id: int = Field(foreign_key="business.id")
+    business_id: int = Field(foreign_key="business.id", index=True)
     image_url: str
     is_primary: bool = Field(default=False)
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
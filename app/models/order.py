@@ -2,18 +2,29 @@
 Order models
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from sqlmodel import SQLModel, Field, Relationship, JSON, Column
-from sqlalchemy import JSON as SQLJSON
+from typing import Optional, List
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 
 
 class Order(SQLModel, table=True):
     """Order/Inquiry model."""
+    __table_args__ = (
+        # Order listings, newest first: a buyer's orders, a business's orders
+        # (optionally by status) and, for admins, all orders
+        Index("ix_order_buyer_id_created_at", "buyer_id", "created_at"),
+        Index("ix_order_business_id_created_at", "business_id", "created_at"),
+        Index("ix_order_business_id_status_created_at", "business_id", "status", "created_at"),
+        Index("ix_order_created_at", "created_at"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="business.id")
     buyer_id: int = Field(foreign_key="user.id")
-    items: Dict[str, Any] = Field(sa_column=Column(SQLJSON))  # JSON: [{"item_id": 1, "quantity": 2, "price": 100}]
+    total_amount: float = Field(default=0.0)  # Sum of quantity * price over the order's lines
     status: str = Field(default="pending")  # pending, accepted, ready_for_pickup, delivered, completed
+    previous_status: Optional[str] = None  # Status before the last transition
+    version: int = Field(default=1)  # Bumped on every status change (optimistic concurrency)
     notes: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -24,12 +35,30 @@ class Order(SQLModel, table=True):
         back_populates="orders_as_buyer",
         sa_relationship_kwargs={"foreign_keys": "Order.buyer_id"}
     )
+    lines: List["OrderLine"] = Relationship(back_populates="order")
     messages: List["OrderMessage"] = Relationship(back_populates="order")
     review: Optional["Review"] = Relationship(back_populates="order")
 
 
+class OrderLine(SQLModel, table=True):
+    """One ordered item with the quantity and unit price at order time."""
+    id: Optional[int] = Field(default=None, primary_key=True)
+    order_id: int = Field(foreign_key="order.id", index=True)
+    item_id: int = Field(foreign_key="businessitem.id", index=True)
+    quantity: int
+    price: float
+    
+    # Relationships
+    order: Order = Relationship(back_populates="lines")
+
+
 class OrderMessage(SQLModel, table=True):
     """Chat messages for orders."""
+    __table_args__ = (
+        # Message history pages: one order's messages in id order
+        Index("ix_ordermessage_order_id_id", "order_id", "id"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     order_id: int = Field(foreign_key="order.id")
     sender_id: int = Field(foreign_key="user.id")
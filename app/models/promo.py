@@ -14,7 +14,7 @@ class Promo(SQLModel, table=True):
     description: Optional[str] = None
     image_url: Optional[str] = None
     promo_type: str  # business_of_week, newly_registered, verified, barangay_endorsed
-    start_date: datetime
+    start_date: datetime = Field(index=True)
     end_date: Optional[datetime] = None
     created_by: int = Field(foreign_key="user.id")  # Admin who created it
     created_at: datetime = Field(default_factory=datetime.utcnow)
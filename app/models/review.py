@@ -4,10 +4,16 @@ Review model
 from datetime import datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 
 
 class Review(SQLModel, table=True):
     """Review model for business ratings."""
+    __table_args__ = (
+        # Visible reviews of a business, newest first
+        Index("ix_review_business_visible_created", "business_id", "is_visible", "created_at"),
+    )
+    
     id: Optional[int] = Field(default=None, primary_key=True)
     order_id: int = Field(foreign_key="order.id", unique=True)  # One review per order
     business_id: int = Field(foreign_key="business.id")
@@ -1,14 +1,15 @@
 """Business routes"""
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.utils.auth import get_current_user, get_current_user_optional, require_admin
 from app.schemas.business import (
     BusinessCreate,
     BusinessUpdate,
     BusinessResponse,
+    BusinessListResponse,
     BusinessItemCreate,
     BusinessItemUpdate,
     BusinessItemResponse,
@@ -27,33 +28,79 @@ from app.controllers.business_controller import (
     delete_business_photo
 )
 from app.utils.auth import get_current_user, require_admin
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.utils.cache import response_cache, cache_key
+from app.utils.serializers import encode, business_dict, business_list_dict
 from app.models.user import User
 
 router = APIRouter()
 
-
-@router.get("", response_model=list[BusinessResponse])
+@router.get("", response_model=Union[list[BusinessResponse], list[BusinessListResponse]])
 async def list_businesses_endpoint(
+    request: Request,
     category: Optional[str] = None,
     verified: Optional[bool] = None,
     distance: Optional[str] = None,
     search: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    lean: bool = False,
+    sort: Literal["newest", "rating"] = "newest",
+    min_rating: Optional[float] = Query(None, ge=1, le=5),
     current_user: Optional[User] = Depends(get_current_user_optional),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """List all businesses with filters."""
-    from app.controllers.marketplace_controller import list_businesses
+    """List businesses with filters.
+
+    Results are paginated; the cursor for the next page is returned in the
+    X-Next-Cursor header. Pass lean=true for the compact listing shape and
+    sort=rating to list the highest rated businesses first.
+    """
+    from app.controllers.marketplace_controller import list_businesses, track_search
     
     user_zone = current_user.address_zone if current_user else None
-    businesses = await list_businesses(
+    
+    # Only distance-filtered listings depend on who is asking
+    key = cache_key(request, user_zone if distance else None)
+    cached = response_cache.get(key)
+    if cached is not None:
+        if search and not cursor:
+            await track_search(search, category)
+        return cached.to_response(request)
+    
+    generation = response_cache.generation
+    businesses, next_cursor = await list_businesses(
         db=db,
         category=category,
         verified=verified,
         distance=distance,
         search=search,
-        user_zone=user_zone
+        user_zone=user_zone,
+        limit=limit,
+        cursor=cursor,
+        lean=lean,
+        sort=sort,
+        min_rating=min_rating
     )
-    return [BusinessResponse.model_validate(b) for b in businesses]
+    
+    if lean:
+        body = encode([business_list_dict(b) for b in businesses], List[BusinessListResponse])
+    else:
+        body = encode([business_dict(b) for b in businesses], List[BusinessResponse])
+    
+    # Dropped when a business joins or leaves the category, when one on the
+    # page changes, or when a change could move another one onto the page
+    tags = [f"category:{category}" if category else "category:*"]
+    tags.extend(f"business:{b.id}" for b in businesses)
+    if verified is not None:
+        tags.append("listing:verified")
+    if sort == "rating" or min_rating is not None:
+        tags.append("listing:rating")
+    if search:
+        tags.append("listing:search")
+    if distance:
+        tags.append("listing:zone")
+    return response_cache.respond(request, key, body, tags, generation, headers={NEXT_CURSOR_HEADER: next_cursor, "Vary": "Authorization"})
 
 
 @router.post("", response_model=BusinessResponse, status_code=201)
@@ -77,17 +124,25 @@ async def create_business_endpoint(
 
 @router.get("/{id}", response_model=BusinessResponse)
 async def get_business_endpoint(
+    request: Request,
     id: int,
-    db: AsyncSession = Depends(get_db)
-) -> BusinessResponse:
+    db: AsyncSession = Depends(get_read_db)
+):
     """Get business by ID."""
-    business = await get_business(db, id)
+    key = cache_key(request)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached.to_response(request)
+    
+    generation = response_cache.generation
+    business = await get_business(db, id, with_details=True)
     if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Business not found"
         )
-    return BusinessResponse.model_validate(business)
+    body = encode(business_dict(business), BusinessResponse)
+    return response_cache.respond(request, key, body, [f"business:{id}"], generation)
 
 
 @router.put("/{id}", response_model=BusinessResponse)
@@ -1,11 +1,17 @@
 """Order routes"""
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.schemas.order import (
     OrderCreate,
     OrderUpdate,
+    OrderBulkStatusUpdate,
+    OrderStatusResult,
     OrderResponse,
     OrderMessageCreate,
     OrderMessageResponse
@@ -15,60 +21,91 @@ from app.controllers.order_controller import (
     get_order,
     list_orders,
     update_order_status,
+    bulk_update_order_status,
     send_order_message,
-    get_order_messages
+    get_order_messages,
+    get_message_page,
+    get_order_messages_since
 )
-from app.utils.auth import get_current_user
+from app.utils.auth import get_current_user, get_streaming_user
+from app.utils.loaders import OrderRelationLoader, get_order_loader
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from app.utils.pubsub import order_events, format_sse, HEARTBEAT_SECONDS
+from app.utils.serializers import serialized_response, order_dict, message_dict
+from app.models.order import Order
 from app.models.user import User
 
 router = APIRouter()
 
+# Newest chat messages embedded in an order's detail; older ones are paged
+# through GET /api/orders/{id}/messages
+ORDER_DETAIL_MESSAGES = 20
+
+
+def _order_response(
+    order: Order,
+    loader: OrderRelationLoader,
+    messages: Sequence[Dict[str, Any]] = ()
+) -> Dict[str, Any]:
+    """Build an order response from loaded relations."""
+    return order_dict(
+        order,
+        business_name=loader.business_name(order.business_id) or "Unknown",
+        buyer_name=loader.user_name(order.buyer_id) or "Unknown",
+        lines=loader.lines.get(order.id),
+        messages=messages
+    )
+
 
 @router.get("", response_model=list[OrderResponse])
 async def list_orders_endpoint(
+    order_status: Optional[str] = Query(None, alias="status"),
+    business_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    loader: OrderRelationLoader = Depends(get_order_loader)
 ):
-    """List orders for the current user."""
-    orders = await list_orders(db, current_user.id, current_user.role)
-    
-    # Enrich with business and buyer names
-    enriched_orders = []
-    for order in orders:
-        from sqlmodel import select
-        from app.models.business import Business
-        
-        result = await db.execute(select(Business).where(Business.id == order.business_id))
-        business = result.scalar_one_or_none()
-        
-        result = await db.execute(select(User).where(User.id == order.buyer_id))
-        buyer = result.scalar_one_or_none()
-        
-        messages = await get_order_messages(db, order.id, current_user.id)
-        
-        enriched_orders.append(OrderResponse(
-            id=order.id,
-            business_id=order.business_id,
-            business_name=business.name if business else "Unknown",
-            buyer_id=order.buyer_id,
-            buyer_name=buyer.full_name if buyer else "Unknown",
-            items=order.items,
-            status=order.status,
-            notes=order.notes,
-            created_at=order.created_at,
-            updated_at=order.updated_at,
-            messages=[OrderMessageResponse.model_validate(m) for m in messages]
-        ))
-    
-    return enriched_orders
+    """List orders for the current user, newest first.
+    
+    Filter by status, business and creation date range (created_from
+    inclusive, created_to exclusive). Results are paginated; the cursor for
+    the next page is returned in the X-Next-Cursor header. Chat messages
+    are not included; fetch them from GET /api/orders/{id}/messages.
+    """
+    orders, next_cursor = await list_orders(
+        db,
+        current_user.id,
+        current_user.role,
+        order_status=order_status,
+        business_id=business_id,
+        created_from=created_from,
+        created_to=created_to,
+        limit=limit,
+        cursor=cursor
+    )
+    
+    # Enrich with business and buyer names and lines in batched queries
+    await loader.load_orders(orders)
+    
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor is not None else None
+    return serialized_response(
+        [_order_response(order, loader) for order in orders],
+        List[OrderResponse],
+        headers=headers
+    )
 
 
 @router.post("", response_model=OrderResponse, status_code=201)
 async def create_order_endpoint(
     order_data: OrderCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-) -> OrderResponse:
+    db: AsyncSession = Depends(get_db),
+    loader: OrderRelationLoader = Depends(get_order_loader)
+):
     """Create a new order."""
     # Convert items to dict format
     items_dict = [item.model_dump() for item in order_data.items]
@@ -81,35 +118,45 @@ async def create_order_endpoint(
         notes=order_data.notes
     )
     
-    # Enrich response
-    from sqlmodel import select
-    from app.models.business import Business
-    
-    result = await db.execute(select(Business).where(Business.id == order.business_id))
-    business = result.scalar_one_or_none()
-    
-    return OrderResponse(
-        id=order.id,
-        business_id=order.business_id,
-        business_name=business.name if business else "Unknown",
-        buyer_id=order.buyer_id,
-        buyer_name=current_user.full_name,
-        items=order.items,
-        status=order.status,
-        notes=order.notes,
-        created_at=order.created_at,
-        updated_at=order.updated_at,
-        messages=[]
+    await loader.load_orders([order])
+    
+    return serialized_response(_order_response(order, loader), OrderResponse, status_code=201)
+
+
+@router.post("/status", response_model=list[OrderStatusResult])
+async def bulk_update_order_status_endpoint(
+    status_data: OrderBulkStatusUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Move several orders to one status (e.g. accept a batch of orders).
+    
+    Returns a result per order ID; orders that cannot be moved are left
+    unchanged and carry the status code and detail explaining why.
+    """
+    results = await bulk_update_order_status(
+        db=db,
+        order_ids=status_data.order_ids,
+        new_status=status_data.status,
+        user_id=current_user.id,
+        role=current_user.role
     )
+    
+    return serialized_response(results, List[OrderStatusResult])
 
 
 @router.get("/{id}", response_model=OrderResponse)
 async def get_order_endpoint(
     id: int,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-) -> OrderResponse:
-    """Get order by ID."""
+    db: AsyncSession = Depends(get_db),
+    loader: OrderRelationLoader = Depends(get_order_loader)
+):
+    """Get order by ID with its newest chat messages.
+    
+    If there are older messages, X-Next-Cursor holds the before_id for
+    paging through them with GET /api/orders/{id}/messages.
+    """
     order = await get_order(db, id, current_user.id)
     
     if not order:
@@ -118,31 +165,13 @@ async def get_order_endpoint(
             detail="Order not found"
         )
     
-    # Enrich response
-    from sqlmodel import select
-    from app.models.business import Business
-    
-    result = await db.execute(select(Business).where(Business.id == order.business_id))
-    business = result.scalar_one_or_none()
-    
-    result = await db.execute(select(User).where(User.id == order.buyer_id))
-    buyer = result.scalar_one_or_none()
-    
-    messages = await get_order_messages(db, order.id, current_user.id)
-    
-    return OrderResponse(
-        id=order.id,
-        business_id=order.business_id,
-        business_name=business.name if business else "Unknown",
-        buyer_id=order.buyer_id,
-        buyer_name=buyer.full_name if buyer else "Unknown",
-        items=order.items,
-        status=order.status,
-        notes=order.notes,
-        created_at=order.created_at,
-        updated_at=order.updated_at,
-        messages=[OrderMessageResponse.model_validate(m) for m in messages]
-    )
+    # Access was checked above, so relations load without re-checking
+    await loader.load_orders([order])
+    rows, next_cursor = await get_message_page(db, id, limit=ORDER_DETAIL_MESSAGES)
+    messages = [message_dict(message, sender_name) for message, sender_name in rows]
+    
+    headers = {NEXT_CURSOR_HEADER: str(next_cursor)} if next_cursor is not None else None
+    return serialized_response(_order_response(order, loader, messages), OrderResponse, headers=headers)
 
 
 @router.put("/{id}/status", response_model=OrderResponse)
@@ -150,42 +179,27 @@ async def update_order_status_endpoint(
     id: int,
     status_data: OrderUpdate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-) -> OrderResponse:
-    """Update order status."""
+    db: AsyncSession = Depends(get_db),
+    loader: OrderRelationLoader = Depends(get_order_loader)
+):
+    """Update order status.
+    
+    Returns 409 if the transition is not allowed from the order's current
+    status, or if version is given and the order has changed since. The
+    response does not include chat messages.
+    """
     order = await update_order_status(
         db=db,
         order_id=id,
         new_status=status_data.status,
         user_id=current_user.id,
-        role=current_user.role
+        role=current_user.role,
+        version=status_data.version
     )
     
-    # Enrich response
-    from sqlmodel import select
-    from app.models.business import Business
-    
-    result = await db.execute(select(Business).where(Business.id == order.business_id))
-    business = result.scalar_one_or_none()
-    
-    result = await db.execute(select(User).where(User.id == order.buyer_id))
-    buyer = result.scalar_one_or_none()
-    
-    messages = await get_order_messages(db, order.id, current_user.id)
-    
-    return OrderResponse(
-        id=order.id,
-        business_id=order.business_id,
-        business_name=business.name if business else "Unknown",
-        buyer_id=order.buyer_id,
-        buyer_name=buyer.full_name if buyer else "Unknown",
-        items=order.items,
-        status=order.status,
-        notes=order.notes,
-        created_at=order.created_at,
-        updated_at=order.updated_at,
-        messages=[OrderMessageResponse.model_validate(m) for m in messages]
-    )
+    await loader.load_orders([order])
+    
+    return serialized_response(_order_response(order, loader), OrderResponse)
 
 
 @router.post("/{id}/messages", response_model=OrderMessageResponse, status_code=201)
@@ -200,18 +214,15 @@ async def send_message_endpoint(
         db=db,
         order_id=id,
         sender_id=current_user.id,
-        message=message_data.message
+        message=message_data.message,
+        sender_name=current_user.full_name
     )
     
-    # Enrich with sender name
-    result = await db.execute(select(User).where(User.id == message.sender_id))
-    sender = result.scalar_one_or_none()
-    
     return OrderMessageResponse(
         id=message.id,
         order_id=message.order_id,
         sender_id=message.sender_id,
-        sender_name=sender.full_name if sender else "Unknown",
+        sender_name=current_user.full_name,
         message=message.message,
         created_at=message.created_at
     )
@@ -220,26 +231,112 @@ async def send_message_endpoint(
 @router.get("/{id}/messages", response_model=list[OrderMessageResponse])
 async def get_messages_endpoint(
     id: int,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get messages for an order."""
-    messages = await get_order_messages(db, id, current_user.id)
-    
-    # Enrich with sender names
-    enriched_messages = []
-    for msg in messages:
-        from sqlmodel import select
-        result = await db.execute(select(User).where(User.id == msg.sender_id))
-        sender = result.scalar_one_or_none()
+    """Get a page of messages for an order, oldest first.
+    
+    Returns the newest messages unless before_id or after_id is given. The
+    X-Next-Cursor header holds the before_id of the next older page, or with
+    after_id the after_id of the next newer page.
+    """
+    rows, next_cursor = await get_order_messages(
+        db, id, current_user.id, before_id=before_id, after_id=after_id, limit=limit
+    )
+    
+    headers = {NEXT_CURSOR_HEADER: str(next_cursor)} if next_cursor is not None else None
+    return serialized_response(
+        [message_dict(message, sender_name) for message, sender_name in rows],
+        List[OrderMessageResponse],
+        headers=headers
+    )
+
+
+async def _order_event_stream(
+    request: Request,
+    order_id: int,
+    queue: asyncio.Queue,
+    backlog: list,
+    last_id: int
+):
+    """Yield backlog messages, then live events, as Server-Sent Events."""
+    try:
+        for message, sender_name in backlog:
+            last_id = message.id
+            yield format_sse({"type": "message", "data": {
+                "id": message.id,
+                "order_id": message.order_id,
+                "sender_id": message.sender_id,
+                "sender_name": sender_name,
+                "message": message.message,
+                "created_at": message.created_at
+            }})
         
-        enriched_messages.append(OrderMessageResponse(
-            id=msg.id,
-            order_id=msg.order_id,
-            sender_id=msg.sender_id,
-            sender_name=sender.full_name if sender else "Unknown",
-            message=msg.message,
-            created_at=msg.created_at
-        ))
-    
-    return enriched_messages
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            
+            if event is None:
+                # Fell behind; the client reconnects with its last event ID
+                break
+            
+            if event["type"] == "message":
+                # Skip messages already sent as part of the backlog
+                if event["data"]["id"] <= last_id:
+                    continue
+                last_id = event["data"]["id"]
+            
+            yield format_sse(event)
+    finally:
+        order_events.unsubscribe(order_id, queue)
+
+
+@router.get("/{id}/events")
+async def order_events_endpoint(
+    id: int,
+    request: Request,
+    since_id: Optional[int] = None,
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_streaming_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream new chat messages and status changes for an order (SSE).
+    
+    Messages after since_id (or the Last-Event-ID header on reconnect) are
+    sent first, followed by live events as they are published.
+    """
+    order = await get_order(db, id, current_user.id)
+    
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    
+    if since_id is None and last_event_id and last_event_id.isdigit():
+        since_id = int(last_event_id)
+    
+    # Subscribe before reading the backlog so nothing published in between is lost
+    queue = order_events.subscribe(id)
+    try:
+        backlog = await get_order_messages_since(db, id, since_id) if since_id is not None else []
+    except Exception:
+        order_events.unsubscribe(id, queue)
+        raise
+    
+    # Release the connection; the stream itself never touches the database
+    # (the user was read in a session that is already closed)
+    await db.close()
+    
+    last_id = backlog[-1][0].id if backlog else (since_id or 0)
+    return StreamingResponse(
+        _order_event_stream(request, id, queue, backlog, last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
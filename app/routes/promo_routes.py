@@ -1,17 +1,22 @@
 """Promo routes"""
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.schemas.promo import PromoCreate, PromoUpdate, PromoResponse
 from app.controllers.promo_controller import (
     create_promo,
     list_promos,
+    seconds_until_next_promo_change,
     update_promo,
     delete_promo
 )
 from app.utils.auth import get_current_user, require_admin
+from app.utils.cache import response_cache, cache_key
+from app.utils.loaders import BatchLoader
+from app.utils.serializers import encode, promo_dict
+from app.models.business import Business
 from app.models.user import User
 
 router = APIRouter()
@@ -19,39 +24,29 @@ router = APIRouter()
 
 @router.get("", response_model=list[PromoResponse])
 async def list_promos_endpoint(
+    request: Request,
     promo_type: Optional[str] = None,
     active_only: bool = True,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all promos."""
+    key = cache_key(request)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached.to_response(request)
+    
+    generation = response_cache.generation
     promos = await list_promos(db, promo_type, active_only)
     
-    # Enrich with business names
-    enriched_promos = []
-    for promo in promos:
-        business_name = None
-        if promo.business_id:
-            from sqlmodel import select
-            from app.models.business import Business
-            
-            result = await db.execute(select(Business).where(Business.id == promo.business_id))
-            business = result.scalar_one_or_none()
-            business_name = business.name if business else None
-        
-        enriched_promos.append(PromoResponse(
-            id=promo.id,
-            business_id=promo.business_id,
-            business_name=business_name,
-            title=promo.title,
-            description=promo.description,
-            image_url=promo.image_url,
-            promo_type=promo.promo_type,
-            start_date=promo.start_date,
-            end_date=promo.end_date,
-            created_at=promo.created_at
-        ))
+    # Enrich with business names in one query
+    businesses = await BatchLoader(db, Business).load_many(promo.business_id for promo in promos)
+    names = {business.id: business.name for business in businesses.values() if business}
+    enriched_promos = [promo_dict(promo, names.get(promo.business_id)) for promo in promos]
     
-    return enriched_promos
+    # The active set changes on its own when a promo starts or ends
+    ttl = await seconds_until_next_promo_change(db) if active_only else None
+    tags = ["promos", *(f"business:{p.business_id}" for p in promos if p.business_id)]
+    return response_cache.respond(request, key, encode(enriched_promos, List[PromoResponse]), tags, generation, ttl=ttl)
 
 
 @router.post("", response_model=PromoResponse, status_code=201)
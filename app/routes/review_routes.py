@@ -1,8 +1,9 @@
 """Review routes"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.schemas.review import ReviewCreate, ReviewResponse
 from app.controllers.review_controller import (
     create_review,
@@ -11,6 +12,9 @@ from app.controllers.review_controller import (
     moderate_review
 )
 from app.utils.auth import get_current_user, require_admin
+from app.utils.cache import response_cache, cache_key
+from app.utils.loaders import BatchLoader
+from app.utils.serializers import encode, review_dict
 from app.models.user import User
 
 router = APIRouter()
@@ -18,33 +22,25 @@ router = APIRouter()
 
 @router.get("/businesses/{business_id}", response_model=list[ReviewResponse])
 async def get_business_reviews_endpoint(
+    request: Request,
     business_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get reviews for a business."""
+    key = cache_key(request)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached.to_response(request)
+    
+    generation = response_cache.generation
     reviews = await get_business_reviews(db, business_id)
     
-    # Enrich with reviewer names
-    enriched_reviews = []
-    for review in reviews:
-        from sqlmodel import select
-        result = await db.execute(select(User).where(User.id == review.reviewer_id))
-        reviewer = result.scalar_one_or_none()
-        
-        enriched_reviews.append(ReviewResponse(
-            id=review.id,
-            order_id=review.order_id,
-            business_id=review.business_id,
-            reviewer_id=review.reviewer_id,
-            reviewer_name=reviewer.full_name if reviewer else None,
-            rating=review.rating,
-            comment=review.comment,
-            photo_url=review.photo_url,
-            created_at=review.created_at,
-            is_visible=review.is_visible
-        ))
+    # Enrich with reviewer names in one query
+    reviewers = await BatchLoader(db, User).load_many({review.reviewer_id for review in reviews})
+    names = {user.id: user.full_name for user in reviewers.values() if user}
     
-    return enriched_reviews
+    body = encode([review_dict(review, names.get(review.reviewer_id)) for review in reviews], List[ReviewResponse])
+    return response_cache.respond(request, key, body, [f"reviews:{business_id}"], generation)
 
 
 @router.post("/orders/{order_id}", response_model=ReviewResponse, status_code=201)
@@ -83,6 +83,9 @@ class BusinessResponse(BaseModel):
     verified_by: Optional[int] = None
     created_at: datetime
     is_active: bool
+    rating_avg: float = 0.0
+    rating_count: int = 0
+    rating_histogram: Dict[int, int] = {}
     items: List[BusinessItemResponse] = []
     photos: List[BusinessPhotoResponse] = []
     
@@ -98,6 +101,8 @@ class BusinessListResponse(BaseModel):
     location_zone: Optional[str] = None
     is_verified: bool
     description: Optional[str] = None
+    rating_avg: float = 0.0
+    rating_count: int = 0
     primary_photo: Optional[str] = None
     
     class Config:
@@ -1,9 +1,12 @@
 """
 Order schemas
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# Most orders a bulk status update may change
+BULK_STATUS_MAX_ORDERS = 100
 
 
 class OrderItem(BaseModel):
@@ -23,6 +26,22 @@ class OrderCreate(BaseModel):
 class OrderUpdate(BaseModel):
     """Order status update schema."""
     status: str  # pending, accepted, ready_for_pickup, delivered, completed
+    version: Optional[int] = None  # Version the client last saw; 409 if the order changed since
+
+
+class OrderBulkStatusUpdate(BaseModel):
+    """Bulk order status update schema."""
+    order_ids: List[int] = Field(..., min_length=1, max_length=BULK_STATUS_MAX_ORDERS)
+    status: str
+
+
+class OrderStatusResult(BaseModel):
+    """Outcome for one order of a bulk status update."""
+    order_id: int
+    status_code: int  # 200 if updated, otherwise what a single update would have returned
+    status: Optional[str] = None
+    version: Optional[int] = None
+    detail: Optional[str] = None
 
 
 class OrderMessageCreate(BaseModel):
@@ -50,12 +69,14 @@ class OrderResponse(BaseModel):
     business_name: str
     buyer_id: int
     buyer_name: str
-    items: Dict[str, Any]
+    items: List[OrderItem]
+    total_amount: float = 0.0
     status: str
+    version: int = 1
     notes: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-    messages: List[OrderMessageResponse] = []
+    messages: List[OrderMessageResponse] = []  # Newest messages, in the order detail only
     
     class Config:
         from_attributes = True
@@ -0,0 +1,187 @@
+"""
+Write-behind buffer for analytics events
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.database import async_session
+from app.models.analytics import AnalyticsEvent
+from app.controllers.analytics_controller import record_search_events
+
+
+logger = logging.getLogger(__name__)
+
+# Flush after this many seconds, or earlier once a batch is full
+FLUSH_INTERVAL_SECONDS = float(os.getenv("ANALYTICS_FLUSH_INTERVAL_SECONDS", "2"))
+BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "500"))
+
+# Maximum number of events held in memory
+QUEUE_SIZE = int(os.getenv("ANALYTICS_QUEUE_SIZE", "10000"))
+
+# What to do when the queue is full:
+#   drop_newest - discard the incoming event
+#   drop_oldest - discard the oldest queued event
+#   block       - wait (up to BLOCK_TIMEOUT_SECONDS) for room, then drop
+OVERFLOW_POLICY = os.getenv("ANALYTICS_OVERFLOW_POLICY", "drop_newest")
+BLOCK_TIMEOUT_SECONDS = float(os.getenv("ANALYTICS_BLOCK_TIMEOUT_SECONDS", "0.5"))
+
+
+class AnalyticsBuffer:
+    """Batch analytics events in memory and write them with multi-row inserts.
+    
+    Events are queued from the request path without touching the database.
+    A background task flushes them every FLUSH_INTERVAL_SECONDS or once
+    BATCH_SIZE events are waiting; stop() flushes whatever is left.
+    """
+    
+    def __init__(
+        self,
+        queue_size: int = QUEUE_SIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        overflow_policy: str = OVERFLOW_POLICY
+    ):
+        if overflow_policy not in ("drop_newest", "drop_oldest", "block"):
+            raise ValueError(f"Unknown analytics overflow policy: {overflow_policy}")
+        
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow_policy = overflow_policy
+        self._task: Optional[asyncio.Task] = None
+        self._batch: List[Dict[str, Any]] = []
+        self._write_lock = asyncio.Lock()
+        self.stats: Dict[str, int] = {
+            "recorded": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "failed": 0
+        }
+    
+    @property
+    def depth(self) -> int:
+        """Number of events waiting to be written."""
+        return self._queue.qsize()
+    
+    async def record(
+        self,
+        event_type: str,
+        business_id: Optional[int] = None,
+        category: Optional[str] = None,
+        search_term: Optional[str] = None
+    ) -> None:
+        """Queue an analytics event."""
+        event = {
+            "event_type": event_type,
+            "business_id": business_id,
+            "category": category,
+            "search_term": search_term,
+            "timestamp": datetime.utcnow()
+        }
+        
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            if not self._enqueue_on_overflow(event) and not await self._wait_for_room(event):
+                self.stats["dropped"] += 1
+                return
+        
+        self.stats["recorded"] += 1
+    
+    def _enqueue_on_overflow(self, event: Dict[str, Any]) -> bool:
+        if self._overflow_policy != "drop_oldest":
+            return False
+        self._queue.get_nowait()
+        self.stats["dropped"] += 1
+        self._queue.put_nowait(event)
+        return True
+    
+    async def _wait_for_room(self, event: Dict[str, Any]) -> bool:
+        if self._overflow_policy != "block":
+            return False
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=BLOCK_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            return False
+        return True
+    
+    async def start(self) -> None:
+        """Start the background flush task.
+        
+        The queue and lock are recreated on the running loop (keeping any
+        queued events), so the buffer survives a restart on a new event loop.
+        """
+        if self._task is None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue.maxsize)
+            while not self._queue.empty():
+                queue.put_nowait(self._queue.get_nowait())
+            self._queue = queue
+            self._write_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background task and flush the remaining events."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+    
+    async def flush(self) -> None:
+        """Write every queued event now."""
+        batch, self._batch = self._batch, []
+        while batch or not self._queue.empty():
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+            batch = []
+    
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self._flush_interval
+            
+            while len(self._batch) < self._batch_size:
+                if not self._queue.empty():
+                    self._batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self._queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Shield the write so shutdown does not cut off an in-flight batch
+            batch, self._batch = self._batch, []
+            await asyncio.shield(self._write(batch))
+    
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        
+        async with self._write_lock:
+            try:
+                async with async_session() as db:
+                    await db.execute(insert(AnalyticsEvent).values(batch))
+                    await record_search_events(db, batch)
+                    await db.commit()
+            except Exception:
+                self.stats["failed"] += len(batch)
+                logger.exception("Failed to write %d analytics events", len(batch))
+                return
+        
+        self.stats["flushed"] += len(batch)
+
+
+analytics_buffer = AnalyticsBuffer()
@@ -2,22 +2,34 @@
 Authentication utilities
 """
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from sqlmodel import select
 
-from app.database import get_db
+from app.database import async_read_session, get_read_db
 from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.executor import BoundedExecutor, ExecutorSaturated
 
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow (~250 ms), so it runs on a small dedicated
+# pool instead of the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+password_executor = BoundedExecutor("password-hash", PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
@@ -26,6 +38,25 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 # HTTP Bearer token
 security = HTTPBearer()
 
+# Cache of verified tokens and user snapshots for authenticated requests
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# User columns kept in the cache; never the password hash
+USER_SNAPSHOT_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "phone",
+    "role",
+    "address_zone",
+    "created_at",
+    "is_active",
+)
+
+_token_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+_user_cache = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
@@ -37,6 +68,27 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def _run_password_work(fn, *args):
+    try:
+        return await password_executor.run(fn, *args)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please try again",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password worker pool."""
+    return await _run_password_work(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password worker pool."""
+    return await _run_password_work(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -49,28 +101,95 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def _decode_token(token: str) -> Optional[int]:
+    """Return the user ID from a valid token, or None.
+    
+    Verified claims are cached until the token's own expiry (capped at the
+    cache TTL), so repeat requests skip the signature check.
+    """
+    user_id = _token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
+        return None
+    
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp else None
+    _token_cache.set(token, user_id, ttl)
+    return user_id
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Return a detached copy of a user, from the snapshot cache if possible."""
+    snapshot = _user_cache.get(user_id)
+    if snapshot is None:
+        result = await db.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+        if user is None:
+            return None
+        snapshot = {name: getattr(user, name) for name in USER_SNAPSHOT_FIELDS}
+        _user_cache.set(user_id, snapshot)
+    
+    # A fresh, session-less instance per request so callers cannot
+    # mutate the cached snapshot
+    return User(**snapshot)
+
+
+def invalidate_user_cache(user_id: Optional[int] = None) -> None:
+    """Drop cached user snapshots, for one user or all of them."""
+    if user_id is None:
+        _user_cache.clear()
+    else:
+        _user_cache.pop(user_id)
+
+
+def _collect_changed_users(session, flush_context, instances) -> None:
+    changed = session.info.setdefault("auth_changed_user_ids", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            changed.add(obj.id)
+
+
+def _invalidate_changed_users(session) -> None:
+    for user_id in session.info.pop("auth_changed_user_ids", ()):
+        invalidate_user_cache(user_id)
+
+
+def _discard_changed_users(session, previous_transaction) -> None:
+    session.info.pop("auth_changed_user_ids", None)
+
+
+# Invalidate snapshots once a change to a user (deactivation, role change,
+# profile edit) is committed
+event.listen(Session, "before_flush", _collect_changed_users)
+event.listen(Session, "after_commit", _invalidate_changed_users)
+event.listen(Session, "after_soft_rollback", _discard_changed_users)
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> User:
-    """Get the current authenticated user."""
+    """Get the current authenticated user.
+    
+    The returned user is a detached snapshot (no password hash, no
+    relationships).
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    user_id = _decode_token(credentials.credentials)
+    if user_id is None:
         raise credentials_exception
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await _load_user(db, user_id)
     
     if user is None:
         raise credentials_exception
@@ -84,25 +203,32 @@ async def get_current_user(
     return user
 
 
+async def get_streaming_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> User:
+    """get_current_user for long-lived responses such as event streams.
+    
+    The user is read in a session that is closed before the endpoint runs;
+    a request-scoped session would hold a pooled connection until the
+    response ends.
+    """
+    async with async_read_session() as db:
+        return await get_current_user(credentials, db)
+
+
 async def get_current_user_optional(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Optional[User]:
     """Get the current authenticated user (optional - returns None if not authenticated)."""
     if not credentials:
         return None
     
-    try:
-        token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            return None
-    except JWTError:
+    user_id = _decode_token(credentials.credentials)
+    if user_id is None:
         return None
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await _load_user(db, user_id)
     
     if user and not user.is_active:
         return None
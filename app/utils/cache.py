@@ -0,0 +1,304 @@
+"""
+In-process caches
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+
+# Public read responses (listings, business detail, reviews, promos)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Response header telling clients whether the body came from the cache
+CACHE_STATUS_HEADER = "X-Cache"
+
+# Browsers may store cached API responses but must revalidate them (by ETag)
+CACHE_CONTROL = "no-cache"
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a time-to-live.
+    
+    Not shared between worker processes; every process keeps its own copy,
+    so the TTL bounds how long an entry can be stale after an external
+    change.
+    """
+    
+    def __init__(self, max_entries: int, ttl: float):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self._max_entries <= 0:
+            return
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        if ttl <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+    
+    def pop(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._entries.clear()
+
+
+def _present(headers: Optional[Dict[str, Optional[str]]]) -> Dict[str, str]:
+    return {name: value for name, value in (headers or {}).items() if value is not None}
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers the given ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return etag in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+
+def json_response(
+    request: Request,
+    body: bytes,
+    headers: Optional[Dict[str, Optional[str]]] = None,
+    cache_status: Optional[str] = None,
+    etag: Optional[str] = None
+) -> Response:
+    """Wrap an already serialized JSON body in a response.
+    
+    Answers 304 Not Modified, without the body, when the request's
+    If-None-Match already names the body's ETag.
+    """
+    etag = etag or compute_etag(body)
+    headers = _present(headers)
+    headers["ETag"] = etag
+    headers["Cache-Control"] = CACHE_CONTROL
+    if cache_status:
+        headers[CACHE_STATUS_HEADER] = cache_status
+    
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class CachedResponse:
+    """A serialized JSON response body plus the headers to replay with it."""
+    
+    __slots__ = ("body", "headers", "tags", "expires_at", "etag")
+    
+    def __init__(self, body: bytes, headers: Dict[str, str], tags: FrozenSet[str], expires_at: float):
+        self.body = body
+        self.headers = headers
+        self.tags = tags
+        self.expires_at = expires_at
+        self.etag = compute_etag(body)
+    
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+    
+    def to_response(self, request: Request) -> Response:
+        return json_response(request, self.body, self.headers, cache_status="HIT", etag=self.etag)
+
+
+class ResponseCache:
+    """LRU cache of serialized public responses, bounded by total bytes.
+    
+    Entries are tagged with what they were built from (``business:<id>``,
+    ``category:<name>``, ``reviews:<business id>``, ``promos``); write paths
+    invalidate the tags they touch after committing. Each worker process
+    keeps its own cache, so the TTL bounds staleness across workers.
+    
+    Take ``generation`` before running the queries for a response and pass
+    it to set(): a body built from data read before one of its tags was
+    invalidated is not stored.
+    """
+    
+    def __init__(self, max_bytes: int, ttl: float):
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = defaultdict(set)
+        self._bytes = 0
+        # Bumped on every invalidation; the generation each tag was last invalidated at
+        self._generation = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+    
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+    
+    @property
+    def generation(self) -> int:
+        return self._generation
+    
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return a live entry, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.stats["misses"] += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry
+    
+    def set(
+        self,
+        key: str,
+        body: bytes,
+        tags: Iterable[str],
+        generation: int,
+        headers: Optional[Dict[str, str]] = None,
+        ttl: Optional[float] = None
+    ) -> None:
+        """Store a response body under a key, evicting old entries to fit.
+        
+        Skipped if any of the tags was invalidated after generation.
+        """
+        ttl = self._ttl if ttl is None else min(ttl, self._ttl)
+        entry = CachedResponse(
+            body,
+            _present(headers),
+            frozenset(tags),
+            time.monotonic() + ttl
+        )
+        if ttl <= 0 or entry.size > self._max_bytes:
+            return
+        if any(self._invalidated_at.get(tag, 0) > generation for tag in entry.tags):
+            return
+        
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        for tag in entry.tags:
+            self._tags[tag].add(key)
+        
+        while self._bytes > self._max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+    
+    def respond(
+        self,
+        request: Request,
+        key: str,
+        body: bytes,
+        tags: Iterable[str],
+        generation: int,
+        headers: Optional[Dict[str, str]] = None,
+        ttl: Optional[float] = None
+    ) -> Response:
+        """Cache a freshly built response body and return it as a response."""
+        self.set(key, body, tags, generation, headers, ttl)
+        return json_response(request, body, headers, cache_status="MISS")
+    
+    def invalidate(self, *tags: str) -> None:
+        """Drop every entry carrying any of the given tags."""
+        self._generation += 1
+        for tag in tags:
+            self._invalidated_at[tag] = self._generation
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+                self.stats["invalidations"] += 1
+    
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._bytes = 0
+    
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def cache_key(request: Request, *variant: Any) -> str:
+    """Cache key from the path, the sorted query parameters and any variant."""
+    params = urlencode(sorted(request.query_params.multi_items()))
+    return "|".join([request.url.path, params, *(str(v) for v in variant)])
+
+
+def business_tags(business_id: int, *categories: Optional[str], listings: Iterable[str] = ()) -> List[str]:
+    """Tags to invalidate when a business changes.
+    
+    Pages showing the business are always dropped. Pass categories only when
+    the business joined or left them (created, deactivated or moved), and
+    listings for the listing filters the change affects (``verified``,
+    ``rating``, ``search``, ``zone``) so filtered pages it was not on yet
+    are dropped too.
+    """
+    tags = [f"business:{business_id}"]
+    if any(categories):
+        tags.append("category:*")
+        tags.extend(f"category:{category}" for category in categories if category)
+    tags.extend(f"listing:{name}" for name in listings)
+    return tags
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL_SECONDS)
@@ -0,0 +1,54 @@
+"""
+Per-business item catalog snapshots
+
+Order validation needs the price and availability of every item a
+business sells. Snapshots are loaded with one query per business and kept
+in memory until an item of that business is added, changed or deleted
+(or CATALOG_CACHE_TTL_SECONDS pass, which bounds staleness across worker
+processes).
+"""
+import os
+from typing import Dict, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.models.business import BusinessItem
+from app.utils.cache import TTLCache
+
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "300"))
+CATALOG_CACHE_MAX_BUSINESSES = int(os.getenv("CATALOG_CACHE_MAX_BUSINESSES", "1000"))
+
+
+class CatalogEntry(NamedTuple):
+    price: float
+    is_available: bool
+
+
+Catalog = Dict[int, CatalogEntry]
+
+_catalogs = TTLCache(CATALOG_CACHE_MAX_BUSINESSES, CATALOG_CACHE_TTL_SECONDS)
+
+# Bumped on invalidation so a snapshot loaded before a change is not stored
+_generations: Dict[int, int] = {}
+
+
+async def get_catalog(db: AsyncSession, business_id: int) -> Catalog:
+    """Item id -> (price, is_available) for every item of a business."""
+    catalog = _catalogs.get(business_id)
+    if catalog is None:
+        generation = _generations.get(business_id, 0)
+        result = await db.execute(
+            select(BusinessItem.id, BusinessItem.price, BusinessItem.is_available)
+            .where(BusinessItem.business_id == business_id)
+        )
+        catalog = {row.id: CatalogEntry(row.price, row.is_available) for row in result.all()}
+        if _generations.get(business_id, 0) == generation:
+            _catalogs.set(business_id, catalog)
+    return catalog
+
+
+def invalidate_catalog(business_id: int) -> None:
+    """Drop a business's snapshot after its items changed."""
+    _generations[business_id] = _generations.get(business_id, 0) + 1
+    _catalogs.pop(business_id)
@@ -1,50 +1,151 @@
 """
 Distance calculation utilities
+
+Zone-to-zone distances come from an optional registry file (ZONE_REGISTRY_PATH)
+listing zone coordinates and/or explicit distances, e.g.::
+
+    {
+        "zones": {"Zone 1": {"lat": 14.5995, "lon": 120.9842}, ...},
+        "distances": {"Zone 1": {"Zone 2": 150}, ...}
+    }
+
+The registry is loaded once into a dense distance matrix. Pairs the registry
+knows nothing about fall back to DEFAULT_ZONE_DISTANCE.
 """
-from typing import Optional, Dict, List
+import json
+import logging
+import math
+import os
+from typing import Optional, Dict, List, Set, Tuple
 
-# Zone mapping for approximate distance calculation
-# This is a simplified mapping - in production, you'd have actual coordinates
-ZONE_DISTANCES: Dict[str, Dict[str, float]] = {
-    # Example zone distances (in meters)
-    # "Zone A": {"Zone B": 150, "Zone C": 300, ...}
-}
+from sqlalchemy import and_
 
+logger = logging.getLogger(__name__)
 
-def calculate_zone_distance(zone1: Optional[str], zone2: Optional[str]) -> Optional[float]:
-    """Calculate approximate distance between two zones in meters."""
-    if not zone1 or not zone2:
-        return None
+ZONE_REGISTRY_PATH = os.getenv("ZONE_REGISTRY_PATH", "zones.json")
+
+# Default: assume zones are in same barangay, estimate 200-500m
+DEFAULT_ZONE_DISTANCE = float(os.getenv("DEFAULT_ZONE_DISTANCE_METERS", "350"))
+
+EARTH_RADIUS_METERS = 6371000.0
+
+# Explicit zone distances (in meters), merged with the registry file
+# "Zone A": {"Zone B": 150, "Zone C": 300, ...}
+ZONE_DISTANCES: Dict[str, Dict[str, float]] = {}
+
+
+def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two coordinates in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+class ZoneDistanceMatrix:
+    """Dense, symmetric matrix of distances between known zones."""
     
-    if zone1 == zone2:
-        return 0.0
+    def __init__(
+        self,
+        coordinates: Dict[str, Tuple[float, float]],
+        distances: Dict[str, Dict[str, float]]
+    ):
+        zones = set(coordinates)
+        for zone, neighbours in distances.items():
+            zones.add(zone)
+            zones.update(neighbours)
+        
+        self.zones: List[str] = sorted(zones)
+        self._index: Dict[str, int] = {zone: i for i, zone in enumerate(self.zones)}
+        size = len(self.zones)
+        self._matrix: List[List[float]] = [[DEFAULT_ZONE_DISTANCE] * size for _ in range(size)]
+        
+        for i, zone in enumerate(self.zones):
+            self._matrix[i][i] = 0.0
+            if zone not in coordinates:
+                continue
+            for j in range(i + 1, size):
+                other = self.zones[j]
+                if other in coordinates:
+                    distance = _haversine(*coordinates[zone], *coordinates[other])
+                    self._matrix[i][j] = self._matrix[j][i] = distance
+        
+        # Explicit distances override computed ones
+        for zone, neighbours in distances.items():
+            for other, distance in neighbours.items():
+                i, j = self._index[zone], self._index[other]
+                self._matrix[i][j] = self._matrix[j][i] = float(distance)
     
-    # Check if we have a direct mapping
-    if zone1 in ZONE_DISTANCES and zone2 in ZONE_DISTANCES[zone1]:
-        return ZONE_DISTANCES[zone1][zone2]
+    def __contains__(self, zone: str) -> bool:
+        return zone in self._index
     
-    # Check reverse mapping
-    if zone2 in ZONE_DISTANCES and zone1 in ZONE_DISTANCES[zone2]:
-        return ZONE_DISTANCES[zone2][zone1]
+    def distance(self, zone1: str, zone2: str) -> float:
+        """Distance between two zones, or the default for unknown pairs."""
+        if zone1 == zone2:
+            return 0.0
+        i, j = self._index.get(zone1), self._index.get(zone2)
+        if i is None or j is None:
+            return DEFAULT_ZONE_DISTANCE
+        return self._matrix[i][j]
     
-    # Default: assume zones are in same barangay, estimate 200-500m
-    return 350.0  # Average distance
+    def zones_within(self, zone: str, max_distance: float) -> Set[str]:
+        """Known zones within max_distance of a zone (including itself)."""
+        i = self._index.get(zone)
+        if i is None:
+            return {zone}
+        return {self.zones[j] for j, distance in enumerate(self._matrix[i]) if distance <= max_distance}
+    
+    def zones_beyond(self, zone: str, max_distance: float) -> Set[str]:
+        """Known zones farther than max_distance from a zone."""
+        i = self._index.get(zone)
+        if i is None:
+            return set()
+        return {self.zones[j] for j, distance in enumerate(self._matrix[i]) if distance > max_distance}
 
 
-def filter_by_distance(
-    user_zone: Optional[str],
-    business_zones: List[tuple],
-    max_distance: float
-) -> List[int]:
-    """Filter business IDs by distance from user zone."""
-    if not user_zone:
-        return [bid for bid, _ in business_zones]
+def load_zone_registry(path: str = ZONE_REGISTRY_PATH) -> ZoneDistanceMatrix:
+    """Build the distance matrix from the registry file and ZONE_DISTANCES."""
+    coordinates: Dict[str, Tuple[float, float]] = {}
+    distances: Dict[str, Dict[str, float]] = {
+        zone: dict(neighbours) for zone, neighbours in ZONE_DISTANCES.items()
+    }
     
-    filtered = []
-    for business_id, business_zone in business_zones:
-        distance = calculate_zone_distance(user_zone, business_zone)
-        if distance is not None and distance <= max_distance:
-            filtered.append(business_id)
+    if os.path.exists(path):
+        with open(path) as f:
+            registry = json.load(f)
+        for zone, point in registry.get("zones", {}).items():
+            coordinates[zone] = (float(point["lat"]), float(point["lon"]))
+        for zone, neighbours in registry.get("distances", {}).items():
+            distances.setdefault(zone, {}).update(neighbours)
+        logger.info("Loaded %d zones from %s", len(coordinates), path)
     
-    return filtered
+    return ZoneDistanceMatrix(coordinates, distances)
+
+
+zone_matrix = load_zone_registry()
+
 
+def calculate_zone_distance(zone1: Optional[str], zone2: Optional[str]) -> Optional[float]:
+    """Calculate approximate distance between two zones in meters."""
+    if not zone1 or not zone2:
+        return None
+    
+    return zone_matrix.distance(zone1, zone2)
+
+
+def zone_filter(column, user_zone: str, max_distance: float):
+    """SQL predicate matching rows whose zone is within max_distance of user_zone.
+    
+    Unknown pairs count as DEFAULT_ZONE_DISTANCE away, so for radii below it
+    the predicate lists the reachable zones, and for larger radii it excludes
+    the known zones that are too far.
+    """
+    if max_distance < DEFAULT_ZONE_DISTANCE:
+        return column.in_(zone_matrix.zones_within(user_zone, max_distance))
+    
+    predicate = and_(column.isnot(None), column != "")
+    too_far = zone_matrix.zones_beyond(user_zone, max_distance)
+    if too_far:
+        predicate = and_(predicate, column.notin_(too_far))
+    return predicate
@@ -0,0 +1,93 @@
+"""
+Bounded thread pool for blocking, CPU-heavy work
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when too many calls are already waiting for a worker."""
+
+
+class BoundedExecutor:
+    """Run blocking functions off the event loop with a concurrency limit.
+    
+    At most ``max_workers`` calls run at once; up to ``max_pending`` more
+    wait for a worker on the event loop, where they stay cancellable. Calls
+    beyond that are rejected with ExecutorSaturated instead of queueing
+    without bound.
+    """
+    
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self._name = name
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+        self.stats: Dict[str, float] = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "max_queue_depth": 0,
+            "wait_seconds_total": 0.0
+        }
+    
+    def start(self) -> None:
+        """Create the worker threads; also after a shutdown, so a new
+        application lifespan gets a working pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=self._name)
+            self._semaphore = asyncio.Semaphore(self._max_workers)
+    
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a worker."""
+        return self._waiting
+    
+    @property
+    def running(self) -> int:
+        """Calls currently running on a worker."""
+        return self._running
+    
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) on a worker thread and return its result."""
+        if self._waiting >= self._max_pending:
+            self.stats["rejected"] += 1
+            raise ExecutorSaturated(f"{self._waiting} calls already waiting")
+        
+        # Started lazily when used outside the application lifespan
+        self.start()
+        executor, semaphore = self._executor, self._semaphore
+        
+        self.stats["submitted"] += 1
+        self._waiting += 1
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self._waiting)
+        queued_at = time.monotonic()
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        
+        self.stats["wait_seconds_total"] += time.monotonic() - queued_at
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, fn, *args)
+        finally:
+            self._running -= 1
+            semaphore.release()
+            self.stats["completed"] += 1
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads without blocking the event loop.
+        
+        Calls not yet started are cancelled; running ones finish in the
+        background. The next run() or start() creates a fresh pool.
+        """
+        executor, self._executor, self._semaphore = self._executor, None, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
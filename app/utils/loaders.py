@@ -0,0 +1,130 @@
+"""
+Request-scoped batch loaders
+
+Loaders collect the keys needed to render a whole page of results and
+resolve them with one ``IN (...)`` query per entity type instead of one
+query per row. Results are cached for the rest of the request.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.database import get_db
+from app.models.business import Business
+from app.models.order import Order, OrderLine
+from app.models.user import User
+
+
+class BatchLoader:
+    """Load rows by key, batching every pending key into a single query."""
+    
+    def __init__(
+        self,
+        db: AsyncSession,
+        model: Any,
+        key: Any = None,
+        many: bool = False,
+        order_by: Sequence[Any] = ()
+    ):
+        self._db = db
+        self._model = model
+        self._key = key if key is not None else model.id
+        self._many = many
+        self._order_by = order_by
+        self._cache: Dict[Any, Any] = {}
+        self._pending: set = set()
+    
+    def prime(self, keys: Iterable[Any]) -> None:
+        """Queue keys for the next dispatch."""
+        for key in keys:
+            if key is not None and key not in self._cache:
+                self._pending.add(key)
+    
+    async def dispatch(self) -> None:
+        """Resolve all queued keys with one query."""
+        if not self._pending:
+            return
+        
+        keys = list(self._pending)
+        self._pending.clear()
+        
+        result = await self._db.execute(
+            select(self._model)
+            .where(self._key.in_(keys))
+            .order_by(*self._order_by)
+        )
+        rows = result.scalars().all()
+        
+        key_name = self._key.key
+        if self._many:
+            grouped: Dict[Any, List[Any]] = defaultdict(list)
+            for row in rows:
+                grouped[getattr(row, key_name)].append(row)
+            for key in keys:
+                self._cache[key] = grouped.get(key, [])
+        else:
+            found = {getattr(row, key_name): row for row in rows}
+            for key in keys:
+                self._cache[key] = found.get(key)
+    
+    async def load(self, key: Any) -> Any:
+        """Load a single key."""
+        self.prime([key])
+        await self.dispatch()
+        return self.get(key)
+    
+    async def load_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """Load several keys at once."""
+        keys = list(keys)
+        self.prime(keys)
+        await self.dispatch()
+        return {key: self.get(key) for key in keys}
+    
+    def get(self, key: Any) -> Any:
+        """Return an already loaded value without querying."""
+        return self._cache.get(key, [] if self._many else None)
+
+
+class OrderRelationLoader:
+    """Businesses, users and lines referenced by a page of orders."""
+    
+    def __init__(self, db: AsyncSession):
+        self.businesses = BatchLoader(db, Business)
+        self.users = BatchLoader(db, User)
+        self.lines = BatchLoader(
+            db,
+            OrderLine,
+            key=OrderLine.order_id,
+            many=True,
+            order_by=(OrderLine.id,)
+        )
+    
+    async def load_orders(self, orders: Sequence[Order]) -> None:
+        """Load every relation needed to render the given orders.
+        
+        Chat messages are not included; they are paged separately.
+        """
+        self.businesses.prime(order.business_id for order in orders)
+        self.users.prime(order.buyer_id for order in orders)
+        self.lines.prime(order.id for order in orders)
+        await self.businesses.dispatch()
+        await self.lines.dispatch()
+        await self.users.dispatch()
+    
+    def business_name(self, business_id: int) -> Optional[str]:
+        """Name of a loaded business."""
+        business = self.businesses.get(business_id)
+        return business.name if business else None
+    
+    def user_name(self, user_id: int) -> Optional[str]:
+        """Full name of a loaded user."""
+        user = self.users.get(user_id)
+        return user.full_name if user else None
+
+
+def get_order_loader(db: AsyncSession = Depends(get_db)) -> OrderRelationLoader:
+    """Request-scoped order relation loader (shares the request's session)."""
+    return OrderRelationLoader(db)
@@ -0,0 +1,240 @@
+"""
+Prometheus-style metrics
+
+Request counts and latency histograms are recorded per route template by
+middleware; pool, cache, analytics queue and password hashing figures are
+read from their owners when /metrics is scraped. Rendered in the Prometheus
+text exposition format without a client library.
+"""
+import ipaddress
+import math
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import Request
+from sqlalchemy.pool import Pool
+
+# Bearer token required to scrape /metrics; without it only loopback
+# clients are served
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = (
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values."""
+    
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self._buckets = tuple(buckets)
+        self._series: Dict[Labels, List[float]] = {}
+    
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            # Per-bucket counts (last one is +Inf), then sum and count
+            series = self._series[key] = [0] * (len(self._buckets) + 1) + [0.0, 0]
+        series[bisect_left(self._buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self._buckets + (math.inf,), series):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(labels + (('le', _format_value(float(bound))),))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {series[-2]}"
+            yield f"{self.name}_count{_format_labels(labels)} {series[-1]}"
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+    
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._series: Dict[Labels, float] = defaultdict(int)
+    
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        self._series[tuple(sorted(labels.items()))] += amount
+    
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self._series.items()):
+            yield f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+
+
+def _sample_family(name: str, kind: str, help: str, samples: Iterable[Tuple[Dict[str, str], float]]) -> List[str]:
+    """Render a metric family from values read at scrape time."""
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(tuple(sorted(labels.items())))} {_format_value(value)}")
+    return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    LATENCY_BUCKETS
+)
+requests_total = Counter("http_requests_total", "Requests by route template and status code")
+pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent getting a connection from the pool (including opening one)",
+    POOL_WAIT_BUCKETS
+)
+
+_in_flight = 0
+_started_at = time.time()
+
+
+def is_loopback(host: Optional[str]) -> bool:
+    """Whether a client address is on this machine."""
+    try:
+        return host is not None and ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return host == "localhost"
+
+
+def route_template(request: Request) -> str:
+    """Route path template (e.g. /api/orders/{id}) so label values stay bounded."""
+    route = request.scope.get("route")
+    return getattr(route, "path_format", None) or "other"
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Count requests and time them per route template."""
+    global _in_flight
+    _in_flight += 1
+    start = time.perf_counter()
+    status_code = "500"
+    try:
+        response = await call_next(request)
+        status_code = str(response.status_code)
+        return response
+    finally:
+        _in_flight -= 1
+        route = route_template(request)
+        request_duration.observe(time.perf_counter() - start, method=request.method, route=route)
+        requests_total.inc(method=request.method, route=route, status=status_code)
+
+
+def timed_pool_class(pool_class: Type[Pool]) -> Type[Pool]:
+    """Subclass of a pool class that times every checkout.
+    
+    Sessions check out a connection lazily, on their first query, through
+    the pool's public connect(). Pool events only fire once a connection has
+    been handed over, so the wait is timed around connect() instead. The
+    engine label is the pool's logging name (pool_logging_name).
+    """
+    class TimedPool(pool_class):
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return super().connect()
+            finally:
+                pool_checkout_wait.observe(time.perf_counter() - start, engine=self.logging_name or "writer")
+    
+    TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{pool_class.__name__}"
+    return TimedPool
+
+
+def _hit_ratio(stats: Dict[str, int]) -> float:
+    lookups = stats["hits"] + stats["misses"]
+    return stats["hits"] / lookups if lookups else 0.0
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text format."""
+    from app.database import engine, read_engine
+    from app.utils.analytics_buffer import analytics_buffer
+    from app.utils.auth import _token_cache, _user_cache, password_executor
+    from app.utils.cache import response_cache
+    from app.utils.catalog import _catalogs
+    
+    lines: List[str] = []
+    lines.extend(_sample_family("process_start_time_seconds", "gauge", "Start time of the process", [({}, _started_at)]))
+    lines.extend(requests_total.render())
+    lines.extend(request_duration.render())
+    lines.extend(_sample_family("http_requests_in_flight", "gauge", "Requests being handled", [({}, _in_flight)]))
+    
+    # Database pools
+    engines = {"writer": engine, "reader": read_engine} if read_engine is not engine else {"writer": engine}
+    checked_out, pool_size = [], []
+    for name, db_engine in engines.items():
+        pool = db_engine.sync_engine.pool
+        if hasattr(pool, "checkedout"):
+            checked_out.append(({"engine": name}, pool.checkedout()))
+            pool_size.append(({"engine": name}, pool.size()))
+    lines.extend(pool_checkout_wait.render())
+    lines.extend(_sample_family("db_pool_checked_out", "gauge", "Connections currently checked out", checked_out))
+    lines.extend(_sample_family("db_pool_size", "gauge", "Connections the pool keeps open", pool_size))
+    
+    # Caches
+    caches = {
+        "response": response_cache,
+        "auth_token": _token_cache,
+        "auth_user": _user_cache,
+        "catalog": _catalogs
+    }
+    for event in ("hits", "misses", "evictions"):
+        lines.extend(_sample_family(
+            f"cache_{event}_total", "counter", f"Cache {event}",
+            [({"cache": name}, cache.stats[event]) for name, cache in caches.items()]
+        ))
+    lines.extend(_sample_family(
+        "cache_hit_ratio", "gauge", "Hits divided by lookups since start",
+        [({"cache": name}, _hit_ratio(cache.stats)) for name, cache in caches.items()]
+    ))
+    lines.extend(_sample_family("cache_entries", "gauge", "Entries held", [({"cache": name}, len(cache)) for name, cache in caches.items()]))
+    lines.extend(_sample_family("response_cache_bytes", "gauge", "Bytes held by the response cache", [({}, response_cache.size_bytes)]))
+    lines.extend(_sample_family("response_cache_invalidations_total", "counter", "Entries dropped by invalidation", [({}, response_cache.stats["invalidations"])]))
+    
+    # Analytics write-behind buffer
+    lines.extend(_sample_family("analytics_queue_depth", "gauge", "Analytics events waiting to be written", [({}, analytics_buffer.depth)]))
+    lines.extend(_sample_family(
+        "analytics_events_total", "counter", "Analytics events by outcome",
+        [({"outcome": outcome}, count) for outcome, count in analytics_buffer.stats.items()]
+    ))
+    
+    # Password hashing pool
+    lines.extend(_sample_family("password_hash_queue_depth", "gauge", "Hashing calls waiting for a worker", [({}, password_executor.queue_depth)]))
+    lines.extend(_sample_family("password_hash_running", "gauge", "Hashing calls running", [({}, password_executor.running)]))
+    lines.extend(_sample_family(
+        "password_hash_calls_total", "counter", "Hashing calls by outcome",
+        [({"outcome": outcome}, password_executor.stats[outcome]) for outcome in ("submitted", "completed", "rejected")]
+    ))
+    lines.extend(_sample_family(
+        "password_hash_wait_seconds_total", "counter", "Time hashing calls spent waiting for a worker",
+        [({}, password_executor.stats["wait_seconds_total"])]
+    ))
+    
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,83 @@
+"""
+In-process publish/subscribe hub for order events
+"""
+import asyncio
+import json
+import os
+from datetime import datetime
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+
+# Events buffered per subscriber before it is considered too slow
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("ORDER_EVENTS_QUEUE_SIZE", "100"))
+
+# Seconds between keep-alive comments on idle event streams
+HEARTBEAT_SECONDS = float(os.getenv("ORDER_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
+class OrderEventHub:
+    """Fan out order chat and status events to subscribers of each order.
+    
+    Subscribers that fall behind are disconnected (they receive ``None``)
+    instead of blocking publishers; clients reconnect with ``since_id`` to
+    fetch what they missed from the database.
+    """
+    
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self._queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+    
+    def subscribe(self, order_id: int) -> asyncio.Queue:
+        """Register a new subscriber queue for an order."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers[order_id].add(queue)
+        return queue
+    
+    def unsubscribe(self, order_id: int, queue: asyncio.Queue) -> None:
+        """Remove a subscriber queue."""
+        queues = self._subscribers.get(order_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[order_id]
+    
+    def publish(self, order_id: int, event_type: str, data: Dict[str, Any]) -> None:
+        """Deliver an event to every subscriber of an order."""
+        event = {"type": event_type, "data": data}
+        for queue in list(self._subscribers.get(order_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow: drop its backlog and tell it to reconnect
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                self.unsubscribe(order_id, queue)
+    
+    def subscriber_count(self, order_id: Optional[int] = None) -> int:
+        """Number of active subscribers, for one order or overall."""
+        if order_id is not None:
+            return len(self._subscribers.get(order_id, ()))
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Format an event as a Server-Sent Events frame."""
+    data = event["data"]
+    lines = []
+    if event["type"] == "message":
+        lines.append(f"id: {data['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(data, default=_json_default)}")
+    return "\n".join(lines) + "\n\n"
+
+
+order_events = OrderEventHub()
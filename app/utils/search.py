@@ -0,0 +1,103 @@
+"""
+Full-text search utilities (SQLite FTS5)
+"""
+import os
+import re
+from typing import Optional
+
+from sqlalchemy import text, select, literal_column, table, column
+from sqlalchemy.sql import Subquery
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# "fts" uses the FTS5 index when the database supports it, "like" forces the
+# plain LIKE scan over name and description.
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "fts").lower()
+
+FTS_TABLE = "business_fts"
+
+# bm25() column weights: name, description, category, items
+FTS_RANK_WEIGHTS = (10.0, 2.0, 4.0, 3.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_INDEX_BUSINESS_SQL = text(f"""
+    INSERT INTO {FTS_TABLE} (rowid, name, description, category, items)
+    SELECT
+        b.id,
+        b.name,
+        coalesce(b.description, ''),
+        b.category,
+        coalesce((SELECT group_concat(i.name, ' ') FROM businessitem i WHERE i.business_id = b.id), '')
+    FROM business b
+""")
+
+
+def fts_enabled(db: AsyncSession) -> bool:
+    """Check whether the FTS index should be used for this session."""
+    return SEARCH_BACKEND == "fts" and db.get_bind().dialect.name == "sqlite"
+
+
+def build_fts_query(search: str) -> Optional[str]:
+    """Turn free-form user input into a safe FTS5 prefix query."""
+    tokens = _TOKEN_RE.findall(search.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def fts_rank_expression() -> str:
+    """bm25() expression used to order matches (lower is more relevant)."""
+    weights = ", ".join(str(w) for w in FTS_RANK_WEIGHTS)
+    return f"bm25({FTS_TABLE}, {weights})"
+
+
+def fts_match_subquery(fts_query: str) -> Subquery:
+    """Subquery of (business_id, rank) rows matching an FTS5 query."""
+    return (
+        select(
+            column("rowid").label("business_id"),
+            literal_column(fts_rank_expression()).label("rank")
+        )
+        .select_from(table(FTS_TABLE))
+        .where(text(f"{FTS_TABLE} MATCH :fts_query").bindparams(fts_query=fts_query))
+        .subquery("fts_matches")
+    )
+
+
+def create_search_index(conn: Connection) -> None:
+    """Create the FTS5 table and rebuild it if it is out of sync."""
+    if conn.dialect.name != "sqlite":
+        return
+
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(name, description, category, items, tokenize = 'unicode61 remove_diacritics 2')"
+    ))
+
+    indexed = conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+    total = conn.execute(text("SELECT count(*) FROM business")).scalar()
+    if indexed != total:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        conn.execute(_INDEX_BUSINESS_SQL)
+
+
+async def index_business(db: AsyncSession, business_id: int) -> None:
+    """Refresh the search index row for a business.
+
+    Runs inside the caller's transaction so the index commits together
+    with the business/item write.
+    """
+    if not fts_enabled(db):
+        return
+
+    await db.flush()
+    await db.execute(
+        text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :business_id"),
+        {"business_id": business_id}
+    )
+    await db.execute(
+        text(f"{_INDEX_BUSINESS_SQL.text} WHERE b.id = :business_id"),
+        {"business_id": business_id}
+    )
@@ -0,0 +1,179 @@
+"""
+Response serialization for list endpoints
+
+Builds response dicts straight from ORM objects and result rows and encodes
+them with orjson, instead of validating every row into a Pydantic model and
+letting FastAPI validate it again against response_model. The dicts mirror
+the schemas in app/schemas field for field, which tests/test_serializers.py
+enforces. VALIDATE_RESPONSES=true additionally checks each payload against
+its schema at runtime, as a debugging aid.
+"""
+import os
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.models.business import Business, BusinessItem, BusinessPhoto
+from app.models.order import Order, OrderLine, OrderMessage
+from app.models.promo import Promo
+from app.models.review import Review
+
+# Debugging aid: check serialized payloads against their response schemas
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+# rating_histogram has integer keys
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def encode(content: Any, schema: Any = None) -> bytes:
+    """Encode a payload as JSON, validating it first if VALIDATE_RESPONSES is on."""
+    if VALIDATE_RESPONSES and schema is not None:
+        _adapter(schema).validate_python(content)
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def serialized_response(
+    content: Any,
+    schema: Any = None,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """JSON response for a payload built by the functions below."""
+    return Response(encode(content, schema), status_code=status_code, media_type="application/json", headers=headers)
+
+
+def business_item_dict(item: BusinessItem) -> Dict[str, Any]:
+    return {
+        "id": item.id,
+        "business_id": item.business_id,
+        "name": item.name,
+        "description": item.description,
+        "price": float(item.price),
+        "image_url": item.image_url,
+        "is_available": item.is_available
+    }
+
+
+def business_photo_dict(photo: BusinessPhoto) -> Dict[str, Any]:
+    return {
+        "id": photo.id,
+        "business_id": photo.business_id,
+        "image_url": photo.image_url,
+        "is_primary": photo.is_primary,
+        "uploaded_at": photo.uploaded_at
+    }
+
+
+def business_dict(business: Business) -> Dict[str, Any]:
+    """BusinessResponse; items and photos must already be loaded."""
+    return {
+        "id": business.id,
+        "owner_id": business.owner_id,
+        "name": business.name,
+        "category": business.category,
+        "operating_hours": business.operating_hours,
+        "location_zone": business.location_zone,
+        "description": business.description,
+        "is_verified": business.is_verified,
+        "verified_at": business.verified_at,
+        "verified_by": business.verified_by,
+        "created_at": business.created_at,
+        "is_active": business.is_active,
+        "rating_avg": float(business.rating_avg or 0.0),
+        "rating_count": business.rating_count or 0,
+        "rating_histogram": business.rating_histogram,
+        "items": [business_item_dict(item) for item in business.items],
+        "photos": [business_photo_dict(photo) for photo in business.photos]
+    }
+
+
+def business_list_dict(row: Any) -> Dict[str, Any]:
+    """BusinessListResponse from a lean listing row."""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "category": row.category,
+        "location_zone": row.location_zone,
+        "is_verified": row.is_verified,
+        "description": row.description,
+        "rating_avg": float(row.rating_avg or 0.0),
+        "rating_count": row.rating_count or 0,
+        "primary_photo": row.primary_photo
+    }
+
+
+def review_dict(review: Review, reviewer_name: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": review.id,
+        "order_id": review.order_id,
+        "business_id": review.business_id,
+        "reviewer_id": review.reviewer_id,
+        "reviewer_name": reviewer_name,
+        "rating": review.rating,
+        "comment": review.comment,
+        "photo_url": review.photo_url,
+        "created_at": review.created_at,
+        "is_visible": review.is_visible
+    }
+
+
+def promo_dict(promo: Promo, business_name: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": promo.id,
+        "business_id": promo.business_id,
+        "business_name": business_name,
+        "title": promo.title,
+        "description": promo.description,
+        "image_url": promo.image_url,
+        "promo_type": promo.promo_type,
+        "start_date": promo.start_date,
+        "end_date": promo.end_date,
+        "created_at": promo.created_at
+    }
+
+
+def message_dict(message: OrderMessage, sender_name: Optional[str]) -> Dict[str, Any]:
+    return {
+        "id": message.id,
+        "order_id": message.order_id,
+        "sender_id": message.sender_id,
+        "sender_name": sender_name,
+        "message": message.message,
+        "created_at": message.created_at
+    }
+
+
+def order_dict(
+    order: Order,
+    business_name: str,
+    buyer_name: str,
+    lines: Iterable[OrderLine],
+    messages: Iterable[Dict[str, Any]] = ()
+) -> Dict[str, Any]:
+    """OrderResponse; messages are already serialized with message_dict."""
+    return {
+        "id": order.id,
+        "business_id": order.business_id,
+        "business_name": business_name,
+        "buyer_id": order.buyer_id,
+        "buyer_name": buyer_name,
+        "items": [
+            {"item_id": line.item_id, "quantity": line.quantity, "price": float(line.price)}
+            for line in lines
+        ],
+        "total_amount": float(order.total_amount or 0.0),
+        "status": order.status,
+        "version": order.version,
+        "notes": order.notes,
+        "created_at": order.created_at,
+        "updated_at": order.updated_at,
+        "messages": list(messages)
+    }
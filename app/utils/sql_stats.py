@@ -0,0 +1,103 @@
+"""
+Per-request SQL instrumentation
+
+Engine events count the statements each request issues and the time spent
+in the database. The totals are sent back in a Server-Timing header and
+logged at debug level; a statement that repeats more than
+SQL_REPEAT_THRESHOLD times in one request (the usual sign of an N+1 query
+loop) is logged as a warning.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Exposes query counts and database time to every client (development only)
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "false").lower() in ("1", "true", "yes")
+
+# Same statement run more often than this in one request is reported
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+
+
+class QueryStats:
+    """Statements issued while handling one request."""
+    
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter = Counter()
+    
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+    
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements run more than threshold times, most frequent first."""
+        return [(s, n) for s, n in self.statements.most_common() if n > threshold]
+    
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats of the request being handled, if any."""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attribute the statements an engine runs to the current request."""
+    if not event.contains(engine.sync_engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def sql_stats_middleware(request: Request, call_next):
+    """Collect SQL stats for a request and report them."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+    elapsed = time.perf_counter() - start
+    
+    response.headers["Server-Timing"] = f"{stats.server_timing()}, total;dur={elapsed * 1000:.2f}"
+    
+    logger.debug(
+        "%s %s: %d queries, %.1f ms in database, %.1f ms total",
+        request.method, request.url.path, stats.count, stats.duration * 1000, elapsed * 1000
+    )
+    for statement, times in stats.repeated(SQL_REPEAT_THRESHOLD):
+        logger.warning(
+            "%s %s ran the same statement %d times (possible N+1): %s",
+            request.method, request.url.path, times, " ".join(statement.split())[:300]
+        )
+    
+    return response
@@ -0,0 +1,166 @@
+"""
+Index audit: run the controller queries and flag full table scans
+
+Builds a scratch SQLite database from the current models, seeds it, calls
+the controllers the API uses on its read and write paths while recording
+every SELECT and UPDATE they issue, then runs EXPLAIN QUERY PLAN on each one.
+
+Usage:
+    python audit_indexes.py [--verbose]
+
+Exits with status 1 if any query scans a table that is not expected to be
+scanned (see ALLOWED_SCANS).
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+
+# Point the app at a scratch database before anything imports app.database
+_scratch_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_scratch_dir.name}/audit.db"
+os.environ["SEARCH_BACKEND"] = os.getenv("SEARCH_BACKEND", "fts")
+
+from fastapi import HTTPException  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.database import engine, async_session  # noqa: E402
+from seed_db import seed_database  # noqa: E402
+
+
+# Tables that are meant to be read whole: small rollups and the FTS index
+ALLOWED_SCANS = {
+    "categoryrollup",
+    "orderstatusrollup",
+    "searchtermdailyrollup",
+    "business_fts",
+}
+
+# "SCAN <table>" without an index is a full table scan; "SCAN <table> USING
+# INDEX" walks an index, "SCAN CONSTANT ROW" reads no table at all and
+# "SCAN anon_<n>" reads the rows of a subquery (checked on its own lines)
+SCAN_PATTERN = re.compile(r"^SCAN (?!CONSTANT ROW)(?!anon_\d+\b)(\w+)\b(?! USING (?:COVERING )?INDEX)(?! VIRTUAL TABLE)")
+
+
+async def run_scenarios() -> None:
+    """Exercise the controllers with representative arguments."""
+    from app.controllers import (
+        analytics_controller,
+        business_controller,
+        marketplace_controller,
+        order_controller,
+        promo_controller,
+        review_controller,
+    )
+    from app.utils.loaders import OrderRelationLoader
+    from app.utils.pagination import encode_cursor
+    
+    async with async_session() as db:
+        # Marketplace listing
+        await marketplace_controller.list_businesses(db)
+        await marketplace_controller.list_businesses(db, lean=True)
+        await marketplace_controller.list_businesses(db, category="Food")
+        await marketplace_controller.list_businesses(db, verified=True)
+        await marketplace_controller.list_businesses(db, search="adobo")
+        await marketplace_controller.list_businesses(db, sort="rating", min_rating=4)
+        await marketplace_controller.list_businesses(db, distance="200m", user_zone="Zone 1")
+        
+        # Business detail and owner paths
+        await business_controller.get_business(db, 1, with_details=True)
+        
+        # Orders
+        orders, _ = await order_controller.list_orders(db, user_id=3)
+        await order_controller.list_orders(db, user_id=2)
+        await order_controller.list_orders(db, user_id=2, order_status="pending", business_id=1)
+        await order_controller.list_orders(db, user_id=1, role="admin")
+        await order_controller.list_orders(db, user_id=1, role="admin", order_status="completed")
+        await order_controller.list_orders(db, user_id=1, role="admin", business_id=1, order_status="pending")
+        await order_controller.list_orders(
+            db, user_id=1, role="admin",
+            created_from=datetime(2026, 1, 1), created_to=datetime(2026, 2, 1),
+            cursor=encode_cursor(datetime(2026, 1, 15), 10)
+        )
+        await order_controller.get_order(db, 1, user_id=3)
+        loader = OrderRelationLoader(db)
+        await loader.load_orders(orders)
+        await order_controller.get_order_messages(db, 1, user_id=3)
+        await order_controller.get_order_messages(db, 1, user_id=3, before_id=10, limit=2)
+        await order_controller.get_order_messages(db, 1, user_id=3, after_id=0, limit=2)
+        await order_controller.get_order_messages_since(db, 1, 0)
+        await order_controller.update_order_status(db, 2, "ready_for_pickup", user_id=3)
+        try:
+            # Rejected change: the update matches nothing and the order is read
+            await order_controller.update_order_status(db, 2, "pending", user_id=3)
+        except HTTPException:
+            await db.rollback()
+        await order_controller.bulk_update_order_status(db, [1, 2, 3], "accepted", user_id=4)
+        
+        # Reviews and promos
+        await review_controller.get_business_reviews(db, 1)
+        await promo_controller.list_promos(db)
+        await promo_controller.list_promos(db, promo_type="verified")
+        await promo_controller.seconds_until_next_promo_change(db)
+        
+        # Admin dashboard
+        await analytics_controller.get_dashboard_stats(db)
+
+
+async def audit(verbose: bool) -> int:
+    await seed_database()
+    
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE")) and not executemany:
+            statements.append((statement, parameters))
+    
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        await run_scenarios()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+    
+    # Deduplicate while keeping the order queries were issued in
+    unique = list({statement: parameters for statement, parameters in statements}.items())
+    
+    problems = 0
+    async with engine.connect() as conn:
+        for statement, parameters in unique:
+            raw = await conn.get_raw_connection()
+            cursor = await raw.driver_connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plan = [row[3] for row in await cursor.fetchall()]
+            await cursor.close()
+            
+            scans = [
+                line for line in plan
+                if (match := SCAN_PATTERN.match(line)) and match.group(1) not in ALLOWED_SCANS
+            ]
+            if scans:
+                problems += 1
+            if scans or verbose:
+                print("FULL SCAN" if scans else "ok", "-", " ".join(statement.split())[:200])
+                for line in plan:
+                    print("    ", line)
+                print()
+    
+    print(f"{len(unique)} distinct queries checked, {problems} with full table scans")
+    return 1 if problems else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every query plan")
+    args = parser.parse_args()
+    
+    try:
+        status = asyncio.run(audit(args.verbose))
+    finally:
+        _scratch_dir.cleanup()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
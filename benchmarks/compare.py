@@ -0,0 +1,55 @@
+"""
+Compare two benchmark result files
+
+Usage:
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+import argparse
+import json
+from typing import Any, Dict
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "rps"]
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any]) -> None:
+    if baseline.get("dataset") != candidate.get("dataset"):
+        print("warning: the runs used different datasets\n")
+    
+    labels = sorted(set(baseline["endpoints"]) | set(candidate["endpoints"]))
+    width = max(len(label) for label in labels + ["TOTAL"])
+    print(f"{'endpoint':<{width}}  " + "  ".join(f"{metric:>28}" for metric in METRICS))
+    
+    rows = [(label, baseline["endpoints"].get(label), candidate["endpoints"].get(label)) for label in labels]
+    rows.append(("TOTAL", baseline["totals"], candidate["totals"]))
+    for label, before, after in rows:
+        if before is None or after is None:
+            print(f"{label:<{width}}  only in {'candidate' if before is None else 'baseline'}")
+            continue
+        cells = [
+            f"{before[metric]:.1f} → {after[metric]:.1f} ({_change(before[metric], after[metric])})"
+            for metric in METRICS
+        ]
+        print(f"{label:<{width}}  " + "  ".join(f"{cell:>28}" for cell in cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    compare(baseline, candidate)
+
+
+if __name__ == "__main__":
+    main()
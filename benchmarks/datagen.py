@@ -0,0 +1,283 @@
+"""
+Synthetic dataset generator
+
+Bulk-inserts a reproducible marketplace (users, businesses, items, photos,
+orders and their lines, messages, reviews and analytics events) with
+multi-row inserts, then rebuilds the derived state the app maintains
+incrementally: the search index, the dashboard rollups and the business
+rating aggregates.
+"""
+import random
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import insert
+
+from app.database import engine, async_session, init_db
+from app.models import (
+    User,
+    Business,
+    BusinessItem,
+    BusinessPhoto,
+    Order,
+    OrderLine,
+    OrderMessage,
+    Review,
+    AnalyticsEvent,
+)
+from app.controllers.analytics_controller import rebuild_rollups
+from app.controllers.order_controller import ORDER_STATUSES, order_total
+from app.utils.auth import hash_password
+from app.utils.search import create_search_index
+
+
+CATEGORIES = ["Food", "Services", "Repairs", "Rentals", "Crafts", "Beauty"]
+ZONES = [f"Zone {n}" for n in range(1, 11)]
+
+# Words used for business names, descriptions, items and search terms
+WORDS = {
+    "Food": ["adobo", "sinigang", "lumpia", "pancit", "lechon", "kakanin", "turon", "halo-halo", "bibingka", "siomai"],
+    "Services": ["tutoring", "laundry", "cleaning", "babysitting", "typing", "printing", "delivery", "errands"],
+    "Repairs": ["appliance", "electronics", "furniture", "plumbing", "aircon", "bicycle", "shoes", "cellphone"],
+    "Rentals": ["tools", "videoke", "tables", "chairs", "tent", "sound system", "bike", "costume"],
+    "Crafts": ["bags", "keychains", "crochet", "candles", "soap", "woodwork", "bracelets", "paintings"],
+    "Beauty": ["haircut", "manicure", "pedicure", "massage", "hair color", "makeup", "threading", "rebond"],
+}
+FIRST_NAMES = ["Maria", "Juan", "Ana", "Carlos", "Jose", "Liza", "Mark", "Grace", "Paolo", "Joy"]
+LAST_NAMES = ["Santos", "Reyes", "Cruz", "Garcia", "Mendoza", "Bautista", "Villanueva", "Ramos"]
+
+# Every generated account uses this password
+PASSWORD = "password123"
+
+CHUNK_SIZE = 5000
+
+
+@dataclass
+class DatasetSize:
+    """How many rows of each kind to generate."""
+    users: int = 1000
+    businesses: int = 200
+    items_per_business: int = 5
+    orders: int = 2000
+    messages_per_order: int = 4
+    review_ratio: float = 0.5  # share of completed orders that get a review
+    analytics_events: int = 10000
+    
+    @classmethod
+    def scaled(cls, users: int) -> "DatasetSize":
+        """Dataset proportional to a number of users."""
+        return cls(
+            users=users,
+            businesses=max(1, users // 5),
+            orders=users * 2,
+            analytics_events=users * 10
+        )
+
+
+@dataclass
+class Dataset:
+    """IDs the benchmark scenarios draw from."""
+    size: DatasetSize
+    seed: int
+    admin_id: int = 1
+    user_ids: List[int] = field(default_factory=list)
+    business_ids: List[int] = field(default_factory=list)
+    business_owner: Dict[int, int] = field(default_factory=dict)
+    business_items: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+    orders: List[Dict[str, int]] = field(default_factory=list)  # id, buyer_id, business_id
+    search_terms: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=lambda: list(CATEGORIES))
+    
+    def summary(self) -> Dict[str, Any]:
+        return {"seed": self.seed, **asdict(self.size)}
+
+
+async def _bulk_insert(model: Any, rows: Iterable[Dict[str, Any]]) -> None:
+    """Insert rows in chunks, one executemany per chunk."""
+    rows = list(rows)
+    async with engine.begin() as conn:
+        for start in range(0, len(rows), CHUNK_SIZE):
+            await conn.execute(insert(model), rows[start:start + CHUNK_SIZE])
+
+
+async def generate(size: DatasetSize, seed: int = 42) -> Dataset:
+    """Create the schema and fill it with a reproducible synthetic dataset."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    dataset = Dataset(size=size, seed=seed)
+    
+    await init_db()
+    
+    # Users (ID 1 is the admin); bcrypt once, not once per user
+    password_hash = hash_password(PASSWORD)
+    users = []
+    for user_id in range(1, size.users + 1):
+        users.append({
+            "id": user_id,
+            "email": f"user{user_id}@bench.local" if user_id > 1 else "admin@bench.local",
+            "password_hash": password_hash,
+            "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "phone": f"09{rng.randrange(10 ** 9):09d}",
+            "role": "admin" if user_id == 1 else "resident",
+            "address_zone": rng.choice(ZONES),
+            "created_at": now - timedelta(days=rng.randrange(365)),
+            "is_active": True
+        })
+    await _bulk_insert(User, users)
+    dataset.user_ids = [user["id"] for user in users[1:]] or [1]
+    
+    # Businesses, their items and a primary photo for most of them
+    businesses, items, photos = [], [], []
+    item_id = 0
+    for business_id in range(1, size.businesses + 1):
+        category = rng.choice(CATEGORIES)
+        words = WORDS[category]
+        owner_id = rng.choice(dataset.user_ids)
+        verified = rng.random() < 0.6
+        created_at = now - timedelta(minutes=rng.randrange(60 * 24 * 365))
+        businesses.append({
+            "id": business_id,
+            "owner_id": owner_id,
+            "name": f"{rng.choice(FIRST_NAMES)}'s {rng.choice(words).title()} {category}",
+            "category": category,
+            "operating_hours": "Mon-Sat 8AM-6PM",
+            "location_zone": rng.choice(ZONES),
+            "description": " ".join(rng.sample(words, k=min(4, len(words)))),
+            "is_verified": verified,
+            "verified_at": created_at if verified else None,
+            "verified_by": 1 if verified else None,
+            "created_at": created_at,
+            "is_active": rng.random() < 0.95
+        })
+        dataset.business_owner[business_id] = owner_id
+        
+        business_items = []
+        for _ in range(size.items_per_business):
+            item_id += 1
+            item = {
+                "id": item_id,
+                "business_id": business_id,
+                "name": rng.choice(words).title(),
+                "description": f"{rng.choice(words)} {rng.choice(words)}",
+                "price": float(rng.randrange(20, 2000)),
+                "image_url": None,
+                "is_available": True
+            }
+            items.append(item)
+            business_items.append({"item_id": item_id, "price": item["price"]})
+        dataset.business_items[business_id] = business_items
+        
+        if rng.random() < 0.8:
+            photos.append({
+                "business_id": business_id,
+                "image_url": f"/static/uploads/bench/{business_id}.jpg",
+                "is_primary": True,
+                "uploaded_at": created_at
+            })
+    
+    await _bulk_insert(Business, businesses)
+    await _bulk_insert(BusinessItem, items)
+    await _bulk_insert(BusinessPhoto, photos)
+    dataset.business_ids = [b["id"] for b in businesses if b["is_active"]]
+    
+    # Orders, their chat and reviews of completed ones
+    orders, lines, messages, reviews = [], [], [], []
+    ratings: Dict[int, List[int]] = {}
+    for order_id in range(1, size.orders + 1):
+        business_id = rng.choice(dataset.business_ids)
+        buyer_id = rng.choice(dataset.user_ids)
+        order_status = rng.choice(ORDER_STATUSES)
+        created_at = now - timedelta(minutes=rng.randrange(60 * 24 * 60))
+        order_lines = [
+            {**item, "order_id": order_id, "quantity": rng.randint(1, 3)}
+            for item in rng.sample(dataset.business_items[business_id], k=min(2, size.items_per_business))
+        ]
+        lines.extend(order_lines)
+        orders.append({
+            "id": order_id,
+            "business_id": business_id,
+            "buyer_id": buyer_id,
+            "total_amount": order_total(order_lines),
+            "status": order_status,
+            "notes": None,
+            "created_at": created_at,
+            "updated_at": created_at
+        })
+        dataset.orders.append({"id": order_id, "buyer_id": buyer_id, "business_id": business_id})
+        
+        participants = (buyer_id, dataset.business_owner[business_id])
+        for n in range(size.messages_per_order):
+            messages.append({
+                "order_id": order_id,
+                "sender_id": participants[n % 2],
+                "message": f"Message {n + 1} about order {order_id}",
+                "created_at": created_at + timedelta(minutes=n)
+            })
+        
+        if order_status == "completed" and rng.random() < size.review_ratio:
+            rating = rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 2, 4, 6])[0]
+            reviews.append({
+                "order_id": order_id,
+                "business_id": business_id,
+                "reviewer_id": buyer_id,
+                "rating": rating,
+                "comment": "Salamat po!",
+                "photo_url": None,
+                "created_at": created_at + timedelta(days=1),
+                "is_visible": True
+            })
+            ratings.setdefault(business_id, []).append(rating)
+    
+    await _bulk_insert(Order, orders)
+    await _bulk_insert(OrderLine, lines)
+    await _bulk_insert(OrderMessage, messages)
+    await _bulk_insert(Review, reviews)
+    
+    # Rating aggregates, as review_controller would have maintained them
+    async with async_session() as db:
+        for business_id, values in ratings.items():
+            aggregates = {
+                "rating_sum": sum(values),
+                "rating_count": len(values),
+                "rating_avg": sum(values) / len(values),
+                **{f"rating_{stars}": values.count(stars) for stars in range(1, 6)}
+            }
+            await db.execute(
+                Business.__table__.update()
+                .where(Business.__table__.c.id == business_id)
+                .values(**aggregates)
+            )
+        await db.commit()
+    
+    # Analytics events: searches and business views
+    dataset.search_terms = sorted({word for words in WORDS.values() for word in words})
+    events = []
+    for _ in range(size.analytics_events):
+        timestamp = now - timedelta(minutes=rng.randrange(60 * 24 * 30))
+        if rng.random() < 0.4:
+            events.append({
+                "event_type": "search",
+                "business_id": None,
+                "category": None,
+                "search_term": rng.choice(dataset.search_terms),
+                "timestamp": timestamp
+            })
+        else:
+            business_id = rng.choice(dataset.business_ids)
+            events.append({
+                "event_type": "business_view",
+                "business_id": business_id,
+                "category": businesses[business_id - 1]["category"],
+                "search_term": None,
+                "timestamp": timestamp
+            })
+    await _bulk_insert(AnalyticsEvent, events)
+    
+    # Derived state the app normally maintains incrementally
+    async with engine.begin() as conn:
+        await conn.run_sync(create_search_index)
+    async with async_session() as db:
+        await rebuild_rollups(db)
+    
+    return dataset
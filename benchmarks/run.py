@@ -0,0 +1,193 @@
+"""
+Run the load-test scenarios against the ASGI app in-process
+
+Generates a synthetic dataset into a scratch SQLite database, starts the app
+(including its lifespan) behind httpx's ASGI transport and drives it with a
+number of concurrent virtual users. Results are written as JSON: latency
+percentiles and throughput per endpoint, plus the dataset and configuration
+needed to reproduce the run.
+
+Usage:
+    python -m benchmarks.run --users 5000 --duration 30 --concurrency 20 --output results.json
+    python -m benchmarks.run --mix browse=1,search=1 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, round(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles (ms) and throughput for one endpoint."""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "count": count,
+        "errors": errors,
+        "rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(_percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    # The app reads its configuration at import time
+    from benchmarks.datagen import DatasetSize, generate
+    from benchmarks.scenarios import DEFAULT_MIX, SCENARIOS, Recorder
+    import httpx
+    from main import app
+    
+    mix = args.mix or DEFAULT_MIX
+    unknown = set(mix) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    
+    size = DatasetSize.scaled(args.users)
+    print(f"Generating dataset ({args.users} users, seed {args.seed})...", file=sys.stderr)
+    started = time.perf_counter()
+    dataset = await generate(size, seed=args.seed)
+    generation_seconds = time.perf_counter() - started
+    
+    recorder = Recorder()
+    completed = 0
+    
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            deadline = time.perf_counter() + args.duration if args.requests is None else None
+            
+            async def virtual_user(index: int) -> None:
+                nonlocal completed
+                rng = random.Random(args.seed * 1000 + index)
+                while True:
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        return
+                    if args.requests is not None and completed >= args.requests:
+                        return
+                    completed += 1
+                    scenario = SCENARIOS[rng.choices(names, weights)[0]]
+                    try:
+                        await scenario(client, recorder, dataset, rng)
+                    except httpx.HTTPError:
+                        pass
+            
+            print(f"Running {args.concurrency} virtual users...", file=sys.stderr)
+            started = time.perf_counter()
+            await asyncio.gather(*(virtual_user(i) for i in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+    
+    endpoints = {
+        label: summarize(samples, recorder.errors[label], elapsed)
+        for label, samples in sorted(recorder.latencies.items())
+    }
+    all_samples = [sample for samples in recorder.latencies.values() for sample in samples]
+    
+    return {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat() + "Z",
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "generation_seconds": round(generation_seconds, 2),
+        },
+        "config": {
+            "concurrency": args.concurrency,
+            "duration_seconds": args.duration if args.requests is None else None,
+            "scenarios": args.requests,
+            "mix": dict(zip(names, weights)),
+            "response_cache": not args.no_response_cache,
+        },
+        "dataset": dataset.summary(),
+        "totals": {
+            "scenarios": completed,
+            **summarize(all_samples, sum(recorder.errors.values()), elapsed),
+            "elapsed_seconds": round(elapsed, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000, help="dataset size; other tables scale with it")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the dataset and the scenario picks")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run (ignored with --requests)")
+    parser.add_argument("--requests", type=int, default=None, help="run this many scenarios instead of a fixed duration")
+    parser.add_argument("--concurrency", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--mix", type=_parse_mix, default=None, help="scenario weights, e.g. browse=5,search=2,order=1")
+    parser.add_argument("--database", default=None, help="SQLite file to generate into (must not exist; default: a temp file)")
+    parser.add_argument("--no-response-cache", action="store_true", help="disable the in-process response cache")
+    parser.add_argument("--output", default=None, help="write the JSON results here instead of stdout")
+    args = parser.parse_args()
+    
+    scratch_dir = None
+    if args.database:
+        if os.path.exists(args.database):
+            parser.error(f"{args.database} already exists")
+        path = os.path.abspath(args.database)
+    else:
+        scratch_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(scratch_dir.name, "bench.db")
+    
+    # Configure the app before anything imports it
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{path}"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if args.no_response_cache:
+        os.environ["RESPONSE_CACHE_MAX_BYTES"] = "0"
+    
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if scratch_dir is not None:
+            scratch_dir.cleanup()
+    
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
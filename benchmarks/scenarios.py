@@ -0,0 +1,127 @@
+"""
+Benchmark scenarios
+
+Each scenario is one user journey made of a few API calls. Calls are timed
+by a Recorder under an endpoint label (the route template, not the concrete
+URL) so results aggregate per endpoint.
+"""
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.utils.auth import create_access_token
+from benchmarks.datagen import Dataset
+
+
+class Recorder:
+    """Collects latencies and errors per endpoint label."""
+    
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self._tokens: Dict[int, Dict[str, str]] = {}
+    
+    def auth(self, user_id: int) -> Dict[str, str]:
+        """Authorization header for a user, minted once per user."""
+        headers = self._tokens.get(user_id)
+        if headers is None:
+            token = create_access_token({"sub": str(user_id)})
+            headers = self._tokens[user_id] = {"Authorization": f"Bearer {token}"}
+        return headers
+    
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        label: str,
+        url: str,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request and record how long it took."""
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            self.latencies[label].append(time.perf_counter() - start)
+            self.errors[label] += 1
+            raise
+        self.latencies[label].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+        return response
+
+
+Scenario = Callable[[httpx.AsyncClient, Recorder, Dataset, random.Random], Awaitable[None]]
+
+
+async def browse(client: httpx.AsyncClient, rec: Recorder, data: Dataset, rng: random.Random) -> None:
+    """Open the marketplace, filter it, then look at one business."""
+    user = rng.choice(data.user_ids)
+    params = {"category": rng.choice(data.categories)}
+    if rng.random() < 0.3:
+        params["sort"] = "rating"
+    if rng.random() < 0.3:
+        params["verified"] = "true"
+    await rec.request(client, "GET", "GET /api/businesses", "/api/businesses", params=params, headers=rec.auth(user))
+    
+    business_id = rng.choice(data.business_ids)
+    await rec.request(client, "GET", "GET /api/businesses/{id}", f"/api/businesses/{business_id}")
+    await rec.request(client, "GET", "GET /api/reviews/businesses/{id}", f"/api/reviews/businesses/{business_id}")
+    await rec.request(client, "GET", "GET /api/promos", "/api/promos")
+
+
+async def search(client: httpx.AsyncClient, rec: Recorder, data: Dataset, rng: random.Random) -> None:
+    """Full-text search, sometimes narrowed to a category or to nearby zones."""
+    user = rng.choice(data.user_ids)
+    params = {"search": rng.choice(data.search_terms), "lean": "true"}
+    if rng.random() < 0.3:
+        params["category"] = rng.choice(data.categories)
+    if rng.random() < 0.2:
+        params["distance"] = "500m"
+    await rec.request(client, "GET", "GET /api/businesses?search", "/api/businesses", params=params, headers=rec.auth(user))
+
+
+async def order(client: httpx.AsyncClient, rec: Recorder, data: Dataset, rng: random.Random) -> None:
+    """Place an order, then open it and the buyer's order list."""
+    buyer = rng.choice(data.user_ids)
+    business_id = rng.choice(data.business_ids)
+    lines = rng.sample(data.business_items[business_id], k=min(2, len(data.business_items[business_id])))
+    payload = {
+        "business_id": business_id,
+        "items": [{**line, "quantity": rng.randint(1, 3)} for line in lines],
+        "notes": "Benchmark order"
+    }
+    response = await rec.request(client, "POST", "POST /api/orders", "/api/orders", json=payload, headers=rec.auth(buyer))
+    if response.status_code == 201:
+        order_id = response.json()["id"]
+        await rec.request(client, "GET", "GET /api/orders/{id}", f"/api/orders/{order_id}", headers=rec.auth(buyer))
+    await rec.request(client, "GET", "GET /api/orders", "/api/orders", headers=rec.auth(buyer))
+
+
+async def chat(client: httpx.AsyncClient, rec: Recorder, data: Dataset, rng: random.Random) -> None:
+    """Send a message on an existing order and reload the conversation."""
+    existing = rng.choice(data.orders)
+    sender = rng.choice([existing["buyer_id"], data.business_owner[existing["business_id"]]])
+    url = f"/api/orders/{existing['id']}/messages"
+    await rec.request(client, "POST", "POST /api/orders/{id}/messages", url, json={"message": "Available pa po?"}, headers=rec.auth(sender))
+    await rec.request(client, "GET", "GET /api/orders/{id}/messages", url, headers=rec.auth(sender))
+
+
+async def dashboard(client: httpx.AsyncClient, rec: Recorder, data: Dataset, rng: random.Random) -> None:
+    """Admin dashboard."""
+    await rec.request(client, "GET", "GET /api/analytics/dashboard", "/api/analytics/dashboard", headers=rec.auth(data.admin_id))
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "browse": browse,
+    "search": search,
+    "order": order,
+    "chat": chat,
+    "dashboard": dashboard,
+}
+
+# Relative weights: mostly reads, a steady trickle of writes
+DEFAULT_MIX = {"browse": 50, "search": 25, "order": 10, "chat": 13, "dashboard": 2}
@@ -2,26 +2,48 @@
 Barangay Home-Based Business Marketplace
 FastAPI application entry point
 """
+import hmac
+import logging
 import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.database import init_db
+from app.database import init_db, async_session, report_database_settings
+from app.controllers.analytics_controller import ensure_rollups
+from app.utils.analytics_buffer import analytics_buffer
+from app.utils.auth import password_executor
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from app.utils.cache import CACHE_STATUS_HEADER
+from app.utils.sql_stats import SQL_INSTRUMENTATION, sql_stats_middleware
+from app.utils.metrics import METRICS_TOKEN, is_loopback, metrics_middleware, render_metrics
 from app.routes import auth_routes, business_routes, order_routes, review_routes, promo_routes, analytics_routes, web_routes
 
 
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(levelname)s:     %(name)s - %(message)s"
+)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan."""
     # Startup
     await init_db()
+    await report_database_settings()
+    async with async_session() as db:
+        await ensure_rollups(db)
+    await analytics_buffer.start()
+    password_executor.start()
     yield
     # Shutdown
+    await analytics_buffer.stop()
+    password_executor.shutdown()
 
 
 # Create FastAPI app
@@ -40,6 +62,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, CACHE_STATUS_HEADER, "ETag", "Server-Timing"],
 )
 
 # Security headers middleware
@@ -52,6 +75,13 @@ async def add_security_headers(request, call_next):
     response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
     return response
 
+# Per-request query counts and database time (Server-Timing header)
+if SQL_INSTRUMENTATION:
+    app.middleware("http")(sql_stats_middleware)
+
+# Request counts and latency per route, exposed at /metrics
+app.middleware("http")(metrics_middleware)
+
 # Mount static files
 static_dir = Path("app/static")
 static_dir.mkdir(parents=True, exist_ok=True)
@@ -78,6 +108,21 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics.
+    
+    Requires METRICS_TOKEN as a bearer token when it is set; otherwise only
+    loopback clients are served.
+    """
+    if METRICS_TOKEN:
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {METRICS_TOKEN}"):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    elif not is_loopback(request.client.host if request.client else None):
+        raise HTTPException(status_code=403, detail="Set METRICS_TOKEN to scrape metrics remotely")
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
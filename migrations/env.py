@@ -27,6 +27,10 @@ from app.models import (
     Review,
     Promo,
     AnalyticsEvent,
+    OrderHourlyRollup,
+    OrderStatusRollup,
+    CategoryRollup,
+    SearchTermDailyRollup,
 )
 from sqlmodel import SQLModel
 
@@ -105,7 +109,7 @@ async def run_async_migrations() -> None:
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
 
-    asyncio.run(run_async_migrations)
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -0,0 +1,157 @@
+"""Baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+The original schema, written out so that this revision never changes with
+the models. Every database created before migrations were introduced (by
+SQLModel.metadata.create_all at startup) already has these tables; for
+them the baseline creates nothing and the later revisions apply as usual.
+The dashboard rollup tables came later but before migrations, so some of
+those databases have them and some do not; revision 0009 creates them
+where they are missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "user",
+    "business",
+    "businessitem",
+    "businessphoto",
+    "order",
+    "ordermessage",
+    "review",
+    "promo",
+    "analyticsevent",
+)
+
+
+def upgrade() -> None:
+    # A database created before migrations existed is already at the baseline
+    if sa.inspect(op.get_bind()).has_table("user"):
+        return
+    
+    op.create_table(
+        "user",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=True),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("address_zone", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_user_email", "user", ["email"], unique=True)
+    
+    op.create_table(
+        "business",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("operating_hours", sa.String(), nullable=True),
+        sa.Column("location_zone", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("is_verified", sa.Boolean(), nullable=False),
+        sa.Column("verified_at", sa.DateTime(), nullable=True),
+        sa.Column("verified_by", sa.Integer(), sa.ForeignKey("user.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    
+    op.create_table(
+        "businessitem",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("business.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("image_url", sa.String(), nullable=True),
+        sa.Column("is_available", sa.Boolean(), nullable=False),
+    )
+    
+    op.create_table(
+        "businessphoto",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("business.id"), nullable=False),
+        sa.Column("image_url", sa.String(), nullable=False),
+        sa.Column("is_primary", sa.Boolean(), nullable=False),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False),
+    )
+    
+    op.create_table(
+        "order",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("business.id"), nullable=False),
+        sa.Column("buyer_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("items", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    
+    op.create_table(
+        "ordermessage",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("order.id"), nullable=False),
+        sa.Column("sender_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    
+    op.create_table(
+        "review",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("order.id"), nullable=False, unique=True),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("business.id"), nullable=False),
+        sa.Column("reviewer_id", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("rating", sa.Integer(), nullable=False),
+        sa.Column("comment", sa.String(), nullable=True),
+        sa.Column("photo_url", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("is_visible", sa.Boolean(), nullable=False),
+    )
+    
+    op.create_table(
+        "promo",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("business.id"), nullable=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("image_url", sa.String(), nullable=True),
+        sa.Column("promo_type", sa.String(), nullable=False),
+        sa.Column("start_date", sa.DateTime(), nullable=False),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("created_by", sa.Integer(), sa.ForeignKey("user.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    
+    op.create_table(
+        "analyticsevent",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("business_id", sa.Integer(), sa.ForeignKey("business.id"), nullable=True),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("search_term", sa.String(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_analyticsevent_timestamp", "analyticsevent", ["timestamp"])
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_table(table)
@@ -0,0 +1,58 @@
+"""Business rating aggregates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RATING_COLUMNS = (
+    ("rating_sum", sa.Integer(), "0"),
+    ("rating_count", sa.Integer(), "0"),
+    ("rating_avg", sa.Float(), "0"),
+    ("rating_1", sa.Integer(), "0"),
+    ("rating_2", sa.Integer(), "0"),
+    ("rating_3", sa.Integer(), "0"),
+    ("rating_4", sa.Integer(), "0"),
+    ("rating_5", sa.Integer(), "0"),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("business") as batch_op:
+        for name, type_, default in RATING_COLUMNS:
+            batch_op.add_column(sa.Column(name, type_, nullable=False, server_default=default))
+    
+    op.create_index("ix_business_rating_avg", "business", ["rating_avg"])
+    
+    # Backfill from visible reviews
+    visible = "FROM review WHERE review.business_id = business.id AND review.is_visible"
+    op.execute(f"""
+        UPDATE business SET
+            rating_sum = (SELECT COALESCE(SUM(rating), 0) {visible}),
+            rating_count = (SELECT COUNT(*) {visible}),
+            rating_avg = COALESCE((SELECT AVG(rating) {visible}), 0),
+            rating_1 = (SELECT COUNT(*) {visible} AND rating = 1),
+            rating_2 = (SELECT COUNT(*) {visible} AND rating = 2),
+            rating_3 = (SELECT COUNT(*) {visible} AND rating = 3),
+            rating_4 = (SELECT COUNT(*) {visible} AND rating = 4),
+            rating_5 = (SELECT COUNT(*) {visible} AND rating = 5)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_business_rating_avg", table_name="business")
+    with op.batch_alter_table("business") as batch_op:
+        for name, _, _ in reversed(RATING_COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,40 @@
+"""Indexes for foreign keys and listing filters
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_order_buyer_id", "order", ["buyer_id"]),
+    ("ix_order_business_id", "order", ["business_id"]),
+    ("ix_ordermessage_order_id", "ordermessage", ["order_id"]),
+    ("ix_review_business_visible_created", "review", ["business_id", "is_visible", "created_at"]),
+    ("ix_businessitem_business_id", "businessitem", ["business_id"]),
+    ("ix_businessphoto_business_id", "businessphoto", ["business_id"]),
+    ("ix_business_owner_id", "business", ["owner_id"]),
+    ("ix_business_category", "business", ["category"]),
+    ("ix_business_active_created", "business", ["is_active", "created_at"]),
+    ("ix_promo_start_date", "promo", ["start_date"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,28 @@
+"""Composite (order_id, id) index for message history pages
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_ordermessage_order_id_id", "ordermessage", ["order_id", "id"])
+    # The composite index serves every lookup the single-column one did
+    op.drop_index("ix_ordermessage_order_id", table_name="ordermessage")
+
+
+def downgrade() -> None:
+    op.create_index("ix_ordermessage_order_id", "ordermessage", ["order_id"])
+    op.drop_index("ix_ordermessage_order_id_id", table_name="ordermessage")
@@ -0,0 +1,113 @@
+"""Order lines table and order totals, replacing the JSON items column
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+order_table = sa.table(
+    "order",
+    sa.column("id", sa.Integer),
+    sa.column("items", sa.JSON),
+    sa.column("total_amount", sa.Float),
+)
+line_table = sa.table(
+    "orderline",
+    sa.column("order_id", sa.Integer),
+    sa.column("item_id", sa.Integer),
+    sa.column("quantity", sa.Integer),
+    sa.column("price", sa.Float),
+)
+
+BATCH_SIZE = 1000
+
+
+def _json(value):
+    return json.loads(value) if isinstance(value, str) else (value or [])
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    
+    op.create_table(
+        "orderline",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("order_id", sa.Integer(), sa.ForeignKey("order.id"), nullable=False),
+        sa.Column("item_id", sa.Integer(), sa.ForeignKey("businessitem.id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_orderline_order_id", "orderline", ["order_id"])
+    op.create_index("ix_orderline_item_id", "orderline", ["item_id"])
+    
+    with op.batch_alter_table("order") as batch_op:
+        batch_op.add_column(sa.Column("total_amount", sa.Float(), nullable=False, server_default="0"))
+    
+    # Backfill lines and totals from the JSON column, in batches
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(order_table.c.id, order_table.c["items"])
+            .where(order_table.c.id > last_id)
+            .order_by(order_table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        
+        lines = []
+        for order_id, items in rows:
+            items = _json(items)
+            lines.extend(
+                {
+                    "order_id": order_id,
+                    "item_id": item["item_id"],
+                    "quantity": item["quantity"],
+                    "price": item["price"]
+                }
+                for item in items
+            )
+            total = round(sum(item["quantity"] * item["price"] for item in items), 2)
+            bind.execute(order_table.update().where(order_table.c.id == order_id).values(total_amount=total))
+        if lines:
+            bind.execute(line_table.insert(), lines)
+    
+    with op.batch_alter_table("order") as batch_op:
+        batch_op.drop_column("items")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    
+    with op.batch_alter_table("order") as batch_op:
+        batch_op.add_column(sa.Column("items", sa.JSON(), nullable=True))
+    
+    # Rebuild the JSON column from the lines
+    items = {}
+    for order_id, item_id, quantity, price in bind.execute(
+        sa.select(line_table.c.order_id, line_table.c.item_id, line_table.c.quantity, line_table.c.price)
+        .order_by(line_table.c.order_id)
+    ):
+        items.setdefault(order_id, []).append({"item_id": item_id, "quantity": quantity, "price": price})
+    for order_id, order_items in items.items():
+        bind.execute(order_table.update().where(order_table.c.id == order_id).values(items=order_items))
+    
+    with op.batch_alter_table("order") as batch_op:
+        batch_op.drop_column("total_amount")
+    op.drop_index("ix_orderline_item_id", table_name="orderline")
+    op.drop_index("ix_orderline_order_id", table_name="orderline")
+    op.drop_table("orderline")
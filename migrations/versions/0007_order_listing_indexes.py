@@ -0,0 +1,43 @@
+"""Composite indexes for paginated, filtered order listings
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_order_buyer_id_created_at", ["buyer_id", "created_at"]),
+    ("ix_order_business_id_status_created_at", ["business_id", "status", "created_at"]),
+    ("ix_order_created_at", ["created_at"]),
+)
+
+# Single-column indexes the composite ones start with
+REPLACED = (
+    ("ix_order_buyer_id", ["buyer_id"]),
+    ("ix_order_business_id", ["business_id"]),
+)
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES:
+        op.create_index(name, "order", columns)
+    for name, _ in REPLACED:
+        op.drop_index(name, table_name="order")
+
+
+def downgrade() -> None:
+    for name, columns in REPLACED:
+        op.create_index(name, "order", columns)
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="order")
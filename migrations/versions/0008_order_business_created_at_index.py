@@ -0,0 +1,25 @@
+"""Index for a business's orders, newest first, without a status filter
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_order_business_id_created_at", "order", ["business_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_order_business_id_created_at", table_name="order")
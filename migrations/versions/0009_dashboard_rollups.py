@@ -0,0 +1,56 @@
+"""Dashboard rollup tables, for databases that predate them
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 19:00:00.000000
+
+The rollups were added before migrations existed, so a database created
+at startup in between already has them while older ones and the baseline
+do not. Only the missing tables are created; they start empty and the
+app rebuilds them from the raw tables at startup (ensure_rollups).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = {
+    "orderhourlyrollup": (
+        sa.Column("bucket", sa.DateTime(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    ),
+    "orderstatusrollup": (
+        sa.Column("status", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    ),
+    "categoryrollup": (
+        sa.Column("category", sa.String(), primary_key=True),
+        sa.Column("total_count", sa.Integer(), nullable=False),
+        sa.Column("active_count", sa.Integer(), nullable=False),
+        sa.Column("verified_count", sa.Integer(), nullable=False),
+    ),
+    "searchtermdailyrollup": (
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("search_term", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    ),
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, columns in TABLES.items():
+        if not inspector.has_table(table):
+            op.create_table(table, *columns)
+
+
+def downgrade() -> None:
+    for table in reversed(list(TABLES)):
+        op.drop_table(table)
@@ -6,10 +6,12 @@ from datetime import datetime
 from app.database import async_session, init_db
 from app.models.user import User
 from app.models.business import Business, BusinessItem, BusinessPhoto
-from app.models.order import Order
+from app.models.order import Order, OrderLine
 from app.models.review import Review
 from app.models.promo import Promo
 from app.utils.auth import hash_password
+from app.controllers.review_controller import record_rating
+from app.controllers.order_controller import order_total
 
 
 async def seed_database():
@@ -244,12 +246,14 @@ async def seed_database():
             order = Order(
                 business_id=order_data["business"].id,
                 buyer_id=order_data["buyer"].id,
-                items=order_data["items"],
+                total_amount=order_total(order_data["items"]),
                 status=order_data["status"],
                 notes=order_data.get("notes")
             )
             db.add(order)
             await db.flush()
+            for item_data in order_data["items"]:
+                db.add(OrderLine(order_id=order.id, **item_data))
             orders.append(order)
         
         # Create a review for completed order
@@ -263,6 +267,7 @@ async def seed_database():
                 is_visible=True
             )
             db.add(review)
+            await record_rating(db, review.business_id, review.rating, 1)
         
         # Create some promos
         promos_data = [
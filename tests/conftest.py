@@ -0,0 +1,77 @@
+"""
+Shared test fixtures
+
+Tests run against a scratch SQLite database that is emptied before each
+test. Async tests use the anyio pytest plugin (``pytestmark =
+pytest.mark.anyio``).
+"""
+import os
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+# Point the app at a scratch database before anything imports app.database
+_scratch_dir = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_scratch_dir.name}/test.db"
+
+from sqlmodel import SQLModel  # noqa: E402
+
+from app.database import engine, async_session, init_db  # noqa: E402
+from app.models import User, Business, BusinessItem  # noqa: E402
+from app.utils.auth import invalidate_user_cache  # noqa: E402
+from app.utils.catalog import _catalogs  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """Session on an empty database."""
+    await init_db()
+    async with engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            await conn.execute(table.delete())
+    _catalogs.clear()
+    invalidate_user_cache()
+    
+    async with async_session() as session:
+        yield session
+
+
+async def add(db, *rows):
+    """Insert rows and return the first, refreshed."""
+    db.add_all(rows)
+    await db.commit()
+    for row in rows:
+        await db.refresh(row)
+    return rows[0]
+
+
+@pytest.fixture
+async def marketplace(db):
+    """A seller with a business and an item, a buyer, a bystander and an admin."""
+    def user(name, role="resident"):
+        return User(
+            email=f"{name}@example.com",
+            password_hash="not-a-real-hash",
+            full_name=name.title(),
+            role=role
+        )
+    
+    seller, buyer, other, admin = user("seller"), user("buyer"), user("other"), user("admin", role="admin")
+    await add(db, seller, buyer, other, admin)
+    
+    business = await add(db, Business(
+        owner_id=seller.id,
+        name="Aling Nena's Kakanin",
+        category="Food",
+        created_at=datetime(2026, 1, 1)
+    ))
+    item = await add(db, BusinessItem(business_id=business.id, name="Bibingka", price=60.0))
+    
+    return SimpleNamespace(seller=seller, buyer=buyer, other=other, admin=admin, business=business, item=item)
@@ -0,0 +1,65 @@
+"""
+An order's event stream stays open for as long as the client listens, so it
+must not keep a pooled database connection checked out while it runs.
+"""
+import asyncio
+
+import pytest
+
+from app.database import engine, read_engine
+from app.models import Order
+from app.utils.auth import create_access_token
+from conftest import add
+from main import app
+
+pytestmark = pytest.mark.anyio
+
+
+def _checked_out() -> int:
+    return sum(
+        db_engine.sync_engine.pool.checkedout()
+        for db_engine in {engine, read_engine}
+        if hasattr(db_engine.sync_engine.pool, "checkedout")
+    )
+
+
+async def test_open_stream_releases_connections(db, marketplace):
+    order = await add(db, Order(business_id=marketplace.business.id, buyer_id=marketplace.buyer.id))
+    await db.close()
+    token = create_access_token({"sub": str(marketplace.buyer.id)})
+    
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": f"/api/orders/{order.id}/events",
+        "raw_path": f"/api/orders/{order.id}/events".encode(),
+        "query_string": b"since_id=0",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+    }
+    disconnected = asyncio.Event()
+    started = asyncio.Event()
+    sent = []
+    
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        sent.append(message)
+        if message["type"] == "http.response.start":
+            started.set()
+    
+    stream = asyncio.create_task(app(scope, receive, send))
+    await asyncio.wait_for(started.wait(), timeout=5)
+    
+    assert sent[0]["status"] == 200
+    assert not stream.done()
+    assert _checked_out() == 0
+    
+    disconnected.set()
+    await asyncio.wait_for(stream, timeout=5)
@@ -0,0 +1,142 @@
+"""
+Order status changes go through one conditional UPDATE; these tests pin down
+who may make each transition, how refusals are reported and what a
+successful change records.
+"""
+from itertools import product
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from app.controllers.analytics_controller import record_order_created
+from app.controllers.order_controller import (
+    ORDER_STATUSES,
+    ORDER_TRANSITIONS,
+    bulk_update_order_status,
+    update_order_status,
+)
+from app.models import Business, Order, OrderStatusRollup
+from conftest import add
+
+pytestmark = pytest.mark.anyio
+
+ACTORS = ["buyer", "seller", "admin"]
+
+
+async def _order(db, marketplace, order_status="pending", business=None, buyer=None) -> Order:
+    order = await add(db, Order(
+        business_id=(business or marketplace.business).id,
+        buyer_id=(buyer or marketplace.buyer).id,
+        total_amount=60.0,
+        status=order_status
+    ))
+    await record_order_created(db, order)
+    await db.commit()
+    return order
+
+
+async def _reload(db, order_id: int) -> Order:
+    return await db.get(Order, order_id, populate_existing=True)
+
+
+@pytest.mark.parametrize("old,new,actor", list(product(ORDER_STATUSES, ORDER_STATUSES, ACTORS)))
+async def test_transition(db, marketplace, old, new, actor):
+    order = await _order(db, marketplace, old)
+    user = getattr(marketplace, actor)
+    actors = ORDER_TRANSITIONS.get((old, new))
+    
+    if actors is not None and (actor == "admin" or actor in actors):
+        updated = await update_order_status(db, order.id, new, user.id, user.role)
+        assert (updated.status, updated.previous_status, updated.version) == (new, old, 2)
+        return
+    
+    with pytest.raises(HTTPException) as refused:
+        await update_order_status(db, order.id, new, user.id, user.role)
+    if actors is None:
+        assert refused.value.status_code == 409
+        assert refused.value.detail == f"Cannot change order status from {old} to {new}"
+    else:
+        assert refused.value.status_code == 403
+        assert refused.value.detail == "Not authorized to make this status change"
+    
+    unchanged = await _reload(db, order.id)
+    assert (unchanged.status, unchanged.previous_status, unchanged.version) == (old, None, 1)
+
+
+async def test_success_records_previous_status_and_bumps_version(db, marketplace):
+    order = await _order(db, marketplace)
+    seller = marketplace.seller
+    
+    await update_order_status(db, order.id, "accepted", seller.id, version=1)
+    await update_order_status(db, order.id, "ready_for_pickup", seller.id, version=2)
+    
+    order = await _reload(db, order.id)
+    assert (order.status, order.previous_status, order.version) == ("ready_for_pickup", "accepted", 3)
+    
+    counts = {row.status: row.count for row in (await db.execute(select(OrderStatusRollup))).scalars()}
+    assert counts == {"pending": 0, "accepted": 0, "ready_for_pickup": 1}
+
+
+async def test_stale_version_conflicts(db, marketplace):
+    order = await _order(db, marketplace)
+    seller = marketplace.seller
+    await update_order_status(db, order.id, "accepted", seller.id)
+    
+    with pytest.raises(HTTPException) as stale:
+        await update_order_status(db, order.id, "ready_for_pickup", seller.id, version=1)
+    assert stale.value.status_code == 409
+    assert stale.value.detail == "Order was updated by someone else; reload it and try again"
+    
+    order = await _reload(db, order.id)
+    assert (order.status, order.version) == ("accepted", 2)
+
+
+@pytest.mark.parametrize("new", ["accepted", "completed"])
+async def test_non_party_gets_not_found(db, marketplace, new):
+    order = await _order(db, marketplace)
+    
+    with pytest.raises(HTTPException) as hidden:
+        await update_order_status(db, order.id, new, marketplace.other.id)
+    assert (hidden.value.status_code, hidden.value.detail) == (404, "Order not found")
+    
+    with pytest.raises(HTTPException) as missing:
+        await update_order_status(db, order.id + 1, new, marketplace.admin.id, "admin")
+    assert (missing.value.status_code, missing.value.detail) == (404, "Order not found")
+
+
+async def test_bulk_update_reports_each_order(db, marketplace):
+    seller = marketplace.seller
+    first = await _order(db, marketplace)
+    second = await _order(db, marketplace)
+    done = await _order(db, marketplace, "completed")
+    elsewhere = await add(db, Business(owner_id=marketplace.other.id, name="Sari-sari", category="Retail"))
+    foreign = await _order(db, marketplace, business=elsewhere, buyer=marketplace.other)
+    missing = foreign.id + 1
+    
+    results = await bulk_update_order_status(
+        db, [first.id, done.id, foreign.id, missing, second.id, first.id], "accepted", seller.id
+    )
+    
+    assert [(result["order_id"], result["status_code"], result["detail"]) for result in results] == [
+        (first.id, 200, None),
+        (done.id, 409, "Cannot change order status from completed to accepted"),
+        (foreign.id, 404, "Order not found"),
+        (missing, 404, "Order not found"),
+        (second.id, 200, None),
+    ]
+    assert [(result["status"], result["version"]) for result in results if result["status_code"] == 200] == [
+        ("accepted", 2),
+        ("accepted", 2),
+    ]
+    
+    for order_id in (first.id, second.id):
+        order = await _reload(db, order_id)
+        assert (order.status, order.previous_status, order.version) == ("accepted", "pending", 2)
+    for order_id, old in ((done.id, "completed"), (foreign.id, "pending")):
+        order = await _reload(db, order_id)
+        assert (order.status, order.previous_status, order.version) == (old, None, 1)
+    assert await _reload(db, missing) is None
+    
+    counts = {row.status: row.count for row in (await db.execute(select(OrderStatusRollup))).scalars()}
+    assert counts == {"pending": 1, "accepted": 2, "completed": 1}
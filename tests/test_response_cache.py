@@ -0,0 +1,19 @@
+"""
+A response built from data read before an invalidation must not be cached.
+"""
+from app.utils.cache import ResponseCache
+
+
+def test_set_skips_bodies_built_before_an_invalidation():
+    cache = ResponseCache(max_bytes=10_000, ttl=60)
+    
+    generation = cache.generation
+    cache.invalidate("business:1")
+    cache.set("/api/businesses/1", b"{}", ["business:1"], generation)
+    cache.set("/api/businesses/2", b"{}", ["business:2"], generation)
+    
+    assert cache.get("/api/businesses/1") is None
+    assert cache.get("/api/businesses/2") is not None
+    
+    cache.set("/api/businesses/1", b"{}", ["business:1"], cache.generation)
+    assert cache.get("/api/businesses/1") is not None
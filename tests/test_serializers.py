@@ -0,0 +1,183 @@
+"""
+The serializers build response dicts by hand; these tests keep them in step
+with the response schemas. Each builder runs on real ORM rows (with
+populated and with empty or null relations) and must produce exactly the
+fields of its schema, encoding to the same JSON FastAPI would produce from
+the schema.
+"""
+import json
+from datetime import datetime
+from typing import Any
+
+import orjson
+import pytest
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from app.controllers.marketplace_controller import list_businesses
+from app.models import Business, BusinessPhoto, Order, OrderLine, OrderMessage, Promo, Review
+from app.schemas.business import BusinessResponse, BusinessListResponse
+from app.schemas.order import OrderMessageResponse, OrderResponse
+from app.schemas.promo import PromoResponse
+from app.schemas.review import ReviewResponse
+from app.utils.serializers import (
+    encode,
+    business_dict,
+    business_list_dict,
+    review_dict,
+    promo_dict,
+    message_dict,
+    order_dict,
+)
+from conftest import add
+
+pytestmark = pytest.mark.anyio
+
+
+def _shape(value: Any) -> Any:
+    """Key structure of a JSON value, ignoring the values themselves."""
+    if isinstance(value, dict):
+        return {key: _shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_shape(item) for item in value]
+    return None
+
+
+def assert_matches_schema(payload: Any, schema: Any) -> None:
+    """Payload validates against the schema, has exactly its fields and
+    encodes to the JSON the schema would produce."""
+    model = schema.model_validate(payload)
+    expected = json.loads(model.model_dump_json())
+    actual = orjson.loads(encode(payload))
+    
+    assert _shape(actual) == _shape(expected)
+    assert actual == expected
+
+
+async def _business(db, business_id: int) -> Business:
+    result = await db.execute(
+        select(Business)
+        .where(Business.id == business_id)
+        .options(selectinload(Business.items), selectinload(Business.photos))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def test_business_dict_with_items_and_photos(db, marketplace):
+    await add(db, BusinessPhoto(business_id=marketplace.business.id, image_url="/static/a.jpg", is_primary=True))
+    
+    business = await _business(db, marketplace.business.id)
+    payload = business_dict(business)
+    
+    assert len(payload["items"]) == 1 and len(payload["photos"]) == 1
+    assert_matches_schema(payload, BusinessResponse)
+
+
+async def test_business_dict_without_relations(db, marketplace):
+    bare = await add(db, Business(owner_id=marketplace.seller.id, name="Bare", category="Crafts"))
+    
+    business = await _business(db, bare.id)
+    payload = business_dict(business)
+    
+    assert payload["items"] == [] and payload["photos"] == []
+    assert payload["verified_at"] is None and payload["location_zone"] is None
+    assert_matches_schema(payload, BusinessResponse)
+
+
+async def test_business_list_dict(db, marketplace):
+    await add(db, BusinessPhoto(business_id=marketplace.business.id, image_url="/static/a.jpg", is_primary=True))
+    await add(db, Business(owner_id=marketplace.seller.id, name="No photo", category="Crafts"))
+    
+    rows, _ = await list_businesses(db, lean=True)
+    
+    photos = {row.name: row.primary_photo for row in rows}
+    assert photos == {"Aling Nena's Kakanin": "/static/a.jpg", "No photo": None}
+    for row in rows:
+        assert_matches_schema(business_list_dict(row), BusinessListResponse)
+
+
+async def _order(db, marketplace) -> Order:
+    return await add(db, Order(
+        business_id=marketplace.business.id,
+        buyer_id=marketplace.buyer.id,
+        total_amount=120.0
+    ))
+
+
+async def test_review_dict(db, marketplace):
+    order = await _order(db, marketplace)
+    full = await add(db, Review(
+        order_id=order.id,
+        business_id=marketplace.business.id,
+        reviewer_id=marketplace.buyer.id,
+        rating=5,
+        comment="Masarap!",
+        photo_url="/static/r.jpg"
+    ))
+    assert_matches_schema(review_dict(full, "Buyer"), ReviewResponse)
+    
+    other_order = await _order(db, marketplace)
+    bare = await add(db, Review(
+        order_id=other_order.id,
+        business_id=marketplace.business.id,
+        reviewer_id=marketplace.buyer.id,
+        rating=3
+    ))
+    assert_matches_schema(review_dict(bare, None), ReviewResponse)
+
+
+async def test_promo_dict(db, marketplace):
+    featured = await add(db, Promo(
+        business_id=marketplace.business.id,
+        title="Business of the week",
+        description="Fresh kakanin daily",
+        image_url="/static/p.jpg",
+        promo_type="business_of_week",
+        start_date=datetime(2026, 1, 1),
+        end_date=datetime(2026, 1, 8),
+        created_by=marketplace.admin.id
+    ))
+    assert_matches_schema(promo_dict(featured, marketplace.business.name), PromoResponse)
+    
+    announcement = await add(db, Promo(
+        title="Barangay fiesta",
+        promo_type="barangay_endorsed",
+        start_date=datetime(2026, 1, 1),
+        created_by=marketplace.admin.id
+    ))
+    assert_matches_schema(promo_dict(announcement, None), PromoResponse)
+
+
+async def test_message_dict(db, marketplace):
+    order = await _order(db, marketplace)
+    message = await add(db, OrderMessage(order_id=order.id, sender_id=marketplace.buyer.id, message="Available pa po?"))
+    
+    assert_matches_schema(message_dict(message, "Buyer"), OrderMessageResponse)
+    assert_matches_schema(message_dict(message, None), OrderMessageResponse)
+
+
+async def test_order_dict_with_lines_and_messages(db, marketplace):
+    order = await _order(db, marketplace)
+    line = await add(db, OrderLine(order_id=order.id, item_id=marketplace.item.id, quantity=2, price=60.0))
+    message = await add(db, OrderMessage(order_id=order.id, sender_id=marketplace.buyer.id, message="Salamat"))
+    
+    payload = order_dict(
+        order,
+        business_name=marketplace.business.name,
+        buyer_name=marketplace.buyer.full_name,
+        lines=[line],
+        messages=[message_dict(message, marketplace.buyer.full_name)]
+    )
+    
+    assert payload["items"] == [{"item_id": marketplace.item.id, "quantity": 2, "price": 60.0}]
+    assert_matches_schema(payload, OrderResponse)
+
+
+async def test_order_dict_without_lines_or_messages(db, marketplace):
+    order = await _order(db, marketplace)
+    
+    payload = order_dict(order, business_name="Unknown", buyer_name="Unknown", lines=[])
+    
+    assert payload["items"] == [] and payload["messages"] == [] and payload["notes"] is None
+    assert_matches_schema(payload, OrderResponse)